@@ -1,8 +1,26 @@
-from flask import Flask, render_template_string, request, redirect, url_for, send_file, jsonify
-import json, os, uuid
-from datetime import datetime, timedelta
-import pandas as pd
-from io import BytesIO
+from flask import Flask, render_template, request, redirect, url_for, send_file, jsonify, abort, Response, stream_with_context, make_response
+from jinja2 import DictLoader
+from werkzeug.http import is_resource_modified
+import json, os, re, sys, time, uuid, threading, sqlite3, tempfile, fcntl, heapq, itertools, hashlib, bisect, gzip
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+import csv, io, pickle
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 app = Flask(__name__)
 app.secret_key = 'skd_university_2025_secret_key'
@@ -12,33 +30,1338 @@ COMPUTER_SESSION_FILE = 'computer_session.json'
 REBLOCK_QUEUE_FILE = 'reblock_queue.json'
 AR_SESSION_FILE = 'ar_session.json'
 VR_SESSION_FILE = 'vr_session.json'
+# Older versions kept a full copy of each verified application here; read only to migrate it away
 VERIFIED_CERTIFICATES_FILE = 'verified_certificates.json'
 POST_SESSION_FILE = 'post_session.json'
+APPLICATIONS_LOG_FILE = 'applications.log'
+
+# Storage backend: 'json' (snapshots + transition log) or 'sqlite'
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json')
+SQLITE_DATABASE = os.environ.get('SQLITE_DATABASE', 'certificates.db')
+
+# Codec for the applications snapshot: 'json' (compact), 'msgpack' (needs msgpack,
+# falls back to json) or 'pickle'. Snapshots are read back whichever codec wrote them.
+SNAPSHOT_CODEC = os.environ.get('SNAPSHOT_CODEC', 'json')
+
+# Cold tier: verified applications older than ARCHIVE_AFTER move out of the
+# store into monthly gzip archives under ARCHIVE_DIR when it is compacted
+ARCHIVE_DIR = 'archive'
+ARCHIVE_AFTER = timedelta(days=int(os.environ.get('ARCHIVE_AFTER_DAYS', 365)))
+
+# Background exports: artifacts and job status files, how long they are kept, and how
+# long a running job may go without saving progress before it is taken as abandoned
+EXPORTS_DIR = 'exports'
+EXPORT_JOB_TTL = timedelta(days=1)
+EXPORT_JOB_STALE = timedelta(minutes=10)
+EXPORT_JOBS_LOCK = os.path.join(EXPORTS_DIR, 'jobs')
+
+# Dashboard pagination: rows per page by default and the most a request may ask for
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Student status lookups (/status/<hall_ticket>) kept in memory, most recently used
+STATUS_CACHE_SIZE = 10000
+
+# Live stage queues (/<stage>/events). Each open dashboard holds a stream, which would
+# tie up a whole sync worker, so they are only served and used when LIVE_QUEUES=1:
+# gunicorn.conf.py sets it along with threaded workers, and the dev server is threaded.
+# How often a stream checks for writes by other workers, how long before it closes
+# (well under gunicorn's 30 s worker timeout; browsers reconnect after SSE_RETRY_MS)
+# and how long it may stay silent before sending a keep-alive comment
+LIVE_QUEUES = os.environ.get('LIVE_QUEUES') == '1'
+SSE_POLL_SECONDS = 2
+SSE_STREAM_SECONDS = 20
+SSE_RETRY_MS = 3000
+SSE_KEEPALIVE_SECONDS = 15
 
 def init_json_files():
-    for f in [APPLICATIONS_FILE, COMPUTER_SESSION_FILE, REBLOCK_QUEUE_FILE, AR_SESSION_FILE, VR_SESSION_FILE, VERIFIED_CERTIFICATES_FILE, POST_SESSION_FILE]:
+    for f in [APPLICATIONS_FILE, COMPUTER_SESSION_FILE, REBLOCK_QUEUE_FILE, AR_SESSION_FILE, VR_SESSION_FILE, POST_SESSION_FILE]:
         if not os.path.exists(f):
-            with open(f, 'w') as fp:
-                json.dump([], fp)
+            save_json(f, [])
 
 def load_json(filename):
+    """Load a JSON file; a missing or empty file reads as an empty list.
+
+    A file that does not parse raises instead of reading as [], so that a
+    later save cannot silently replace the data with an empty list.
+    """
     try:
         with open(filename, 'r', encoding='utf-8') as fp:
-            return json.load(fp)
-    except (FileNotFoundError, json.JSONDecodeError):
+            content = fp.read()
+    except FileNotFoundError:
         return []
+    return json.loads(content) if content.strip() else []
+
+def atomic_write(filename, content):
+    """Replace filename by writing a temp file next to it, fsyncing it and renaming it over the original"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filename)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(content)
+            fp.flush()
+            os.fsync(fp.fileno())
+        try:
+            os.chmod(tmp, os.stat(filename).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
 
 def save_json(filename, data):
-    with open(filename, 'w', encoding='utf-8') as fp:
-        json.dump(data, fp, indent=2, ensure_ascii=False)
+    atomic_write(filename, json.dumps(data, indent=2, ensure_ascii=False))
+
+# Binary snapshots start with a header line: SNAPSHOT_MAGIC, the codec and SNAPSHOT_VERSION
+SNAPSHOT_MAGIC = b'SKDSNAP'
+SNAPSHOT_VERSION = 1
+
+def encode_snapshot(data, codec='json'):
+    """Serialize a snapshot; JSON is written compactly and without a header, so older versions can read it"""
+    if codec == 'msgpack' and msgpack is None:
+        codec = 'json'
+    if codec == 'json':
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if codec == 'msgpack':
+        body = msgpack.packb(data, use_bin_type=True)
+    elif codec == 'pickle':
+        body = pickle.dumps(data, protocol=5)
+    else:
+        raise ValueError(f"Unknown snapshot codec: {codec}")
+    return b'%s %s %d\n' % (SNAPSHOT_MAGIC, codec.encode('ascii'), SNAPSHOT_VERSION) + body
+
+def decode_snapshot(content):
+    """Deserialize a snapshot written by encode_snapshot with any codec, or by save_json"""
+    if not content.startswith(SNAPSHOT_MAGIC):
+        text = content.decode('utf-8')
+        return json.loads(text) if text.strip() else []
+    header, _, body = content.partition(b'\n')
+    _, codec, version = header.decode('ascii').split(' ')
+    if int(version) != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    if codec == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError("Snapshot was written with msgpack, which is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if codec == 'pickle':
+        return pickle.loads(body)
+    raise ValueError(f"Unknown snapshot codec: {codec}")
+
+def load_snapshot(filename):
+    """Load a snapshot file of any codec; a missing or empty file reads as an empty list"""
+    try:
+        with open(filename, 'rb') as fp:
+            content = fp.read()
+    except FileNotFoundError:
+        return []
+    return decode_snapshot(content)
+
+def save_snapshot(filename, data, codec='json'):
+    atomic_write(filename, encode_snapshot(data, codec))
+
+@contextmanager
+def file_lock(path):
+    """Exclusive cross-process lock (fcntl) on path + '.lock', shared by all gunicorn workers"""
+    with open(path + '.lock', 'a') as fp:
+        fcntl.flock(fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+def file_signature(filename):
+    """Return (inode, mtime, size) for a file, or None if it does not exist"""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+# Workflow stages (see Workflow): display name, status/time fields flipped on approval,
+# the value written to the status field, the overall status label, the stage
+# it follows, the endpoint and template of its dashboard (plus a review page
+# before approval, if it has one), then how the stage appears in the student
+# timeline (icon, status shown once approved, descriptions once done and
+# while waiting). A stage may also list 'certificate_types' to apply only
+# to those; other applications skip it. Keys double as the stages' URL prefixes.
+STAGES = {
+    'block': {'name': 'Block Office', 'status_field': 'verification_status', 'time_field': 'verification_time', 'approved': 'approve', 'label': 'Approved by Block Office', 'predecessor': None, 'endpoint': 'block_office', 'template': 'stage_queue.html', 'review_template': 'review_stage.html',
+              'icon': 'fa-building', 'done_status': 'Approved', 'done_description': 'Document verification completed', 'waiting_description': 'Waiting for document verification'},
+    'computer_session': {'name': 'Computer Session', 'status_field': 'computer_session_status', 'time_field': 'computer_session_time', 'approved': 'approved', 'label': 'Approved by Computer Session', 'predecessor': 'block', 'endpoint': 'computer_session', 'template': 'stage_queue.html',
+                         'icon': 'fa-laptop', 'done_status': 'Approved', 'done_description': 'Digital processing completed', 'waiting_description': 'Waiting for computer processing'},
+    'reblock': {'name': 'Re-Block Queue', 'status_field': 'reblock_status', 'time_field': 'reblock_time', 'approved': 'approved', 'label': 'Approved by Re-Block', 'predecessor': 'computer_session', 'endpoint': 'reblock_queue', 'template': 'stage_queue.html',
+                'icon': 'fa-redo', 'done_status': 'Completed', 'done_description': 'Re-blocking process completed', 'waiting_description': 'Waiting for previous steps'},
+    'ar_session': {'name': 'AR Session', 'status_field': 'ar_status', 'time_field': 'ar_time', 'approved': 'approved', 'label': 'Approved by AR Session', 'predecessor': 'reblock', 'endpoint': 'ar_session', 'template': 'stage_queue.html',
+                   'icon': 'fa-cube', 'done_status': 'Approved', 'done_description': 'Augmented reality verification', 'waiting_description': 'Waiting for previous steps'},
+    'vr_session': {'name': 'VR Session', 'status_field': 'vr_status', 'time_field': 'vr_time', 'approved': 'approved', 'label': 'Approved by VR Session', 'predecessor': 'ar_session', 'endpoint': 'vr_session', 'template': 'stage_queue.html',
+                   'icon': 'fa-vr-cardboard', 'done_status': 'Approved', 'done_description': 'Virtual reality processing', 'waiting_description': 'Waiting for previous steps'},
+    'post_session': {'name': 'Post Session', 'status_field': 'post_status', 'time_field': 'post_time', 'approved': 'approved', 'label': 'Approved by Post Session', 'predecessor': 'vr_session', 'endpoint': 'post_session', 'template': 'stage_queue.html',
+                     'icon': 'fa-mail-bulk', 'done_status': 'Approved', 'done_description': 'Final processing completed', 'waiting_description': 'Waiting for previous steps'},
+}
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class Workflow:
+    """Stage pipeline declared by a stage table such as STAGES.
+
+    Stages are chained through their 'predecessor' (None for the first one).
+    A stage that lists 'certificate_types' only applies to applications of
+    those types; the others skip it and wait at the next stage that applies.
+    An application is verified when the last stage on its path approves it.
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+        successors = {}
+        for key, stage in stages.items():
+            predecessor = stage.get('predecessor')
+            if predecessor is not None and predecessor not in stages:
+                raise ValueError(f"Stage {key} follows unknown stage {predecessor}")
+            if predecessor in successors:
+                raise ValueError(f"Stages {successors[predecessor]} and {key} both follow {predecessor}")
+            successors[predecessor] = key
+        self.order = []
+        key = successors.get(None)
+        while key is not None:
+            self.order.append(key)
+            key = successors.get(key)
+        if len(self.order) != len(stages):
+            raise ValueError("Stages must form one chain starting at a stage without a predecessor")
+        self._paths = {}
+
+    def path(self, certificate_type):
+        """Keys of the stages an application of certificate_type goes through, in order"""
+        path = self._paths.get(certificate_type)
+        if path is None:
+            path = self._paths[certificate_type] = tuple(
+                key for key in self.order
+                if self.stages[key].get('certificate_types') is None or certificate_type in self.stages[key]['certificate_types'])
+        return path
+
+    def pending_stage(self, a):
+        """Key of the stage whose queue an application is waiting in, or None once it has left the workflow"""
+        previous_approved = True
+        for key in self.path(a.get('certificate_type')):
+            stage = self.stages[key]
+            status = a.get(stage['status_field'])
+            if not status:
+                return key if previous_approved else None
+            previous_approved = status == stage['approved']
+        return None
+
+    def current_stage(self, a):
+        """Name of the latest stage that has acted on an application"""
+        if a.get('verified_time'):
+            return 'Verified Certificates'
+        for key in reversed(self.path(a.get('certificate_type'))):
+            if a.get(self.stages[key]['status_field']):
+                return self.stages[key]['name']
+        return 'Application Submitted'
+
+    def transition(self, key, certificate_type, status, timestamp):
+        """Fields set by a stage's decision; approval at the end of the path also verifies the certificate"""
+        stage = self.stages[key]
+        changes = {stage['status_field']: status, stage['time_field']: timestamp, 'status': stage['label']}
+        if self.path(certificate_type)[-1:] == (key,) and status == stage['approved']:
+            changes['verified_time'] = timestamp
+        return changes
+
+WORKFLOW = Workflow(STAGES)
+
+# Columns of an application record, in the order submit_application builds them
+APPLICATION_FIELDS = [
+    'app_number', 'student_name', 'roll_number', 'degree_type', 'sub_category', 'certificate_type',
+    'certificate_documents', 'fee_option', 'fee_option_label', 'status', 'submission_time',
+    'verification_time', 'verification_status', 'computer_session_status', 'computer_session_time',
+    'reblock_status', 'reblock_time', 'ar_status', 'ar_time', 'vr_status', 'vr_time',
+    'post_status', 'post_time', 'verified_time',
+]
+
+# Fields the indexes, search and exports read as text; None means never filled in
+TEXT_FIELDS = ['app_number', 'student_name', 'roll_number', 'degree_type', 'sub_category', 'certificate_type', 'fee_option']
+
+def malformed_fields(record):
+    """Fields of an application record with a type the store cannot index or export"""
+    bad = [f for f in TEXT_FIELDS if record.get(f) is not None and not isinstance(record.get(f), str)]
+    documents = record.get('certificate_documents')
+    if documents is not None and not (isinstance(documents, (list, tuple)) and all(isinstance(d, str) for d in documents)):
+        bad.append('certificate_documents')
+    return bad
+
+NOT_SPECIFIED = 'Not specified'
+
+def count_labels(counts):
+    """Counts keyed by a field's value, with unset values under NOT_SPECIFIED so the keys stay sortable"""
+    labelled = Counter()
+    for value, count in counts.items():
+        labelled[NOT_SPECIFIED if value is None else value] += count
+    return dict(labelled)
+
+class Application:
+    """One application, held in slots rather than a per-record dict.
+
+    Reads work as on the dict it replaces (a['field'], a.get, 'field' in a,
+    keys/items, dict(a) and ** unpacking) and update() changes fields in
+    place. Categorical values (degree, program, certificate type, fee option
+    and the status strings) and timestamps, which repeat across a record's
+    stages and across bulk approvals, are interned so records share one copy
+    of each; the document list is kept as a tuple. A field that was never
+    set reads as missing, like a missing dict key; keys outside
+    APPLICATION_FIELDS are kept in `extra`. to_dict() gives the JSON wire
+    format.
+    """
+
+    __slots__ = tuple(APPLICATION_FIELDS) + ('extra',)
+
+    FIELDS = frozenset(APPLICATION_FIELDS)
+    INTERNED_FIELDS = frozenset(['degree_type', 'sub_category', 'certificate_type', 'fee_option', 'fee_option_label', 'status']
+                                + [f for f in APPLICATION_FIELDS if f.endswith(('_status', '_time'))])
+
+    def __init__(self, record=()):
+        self.extra = None
+        self.update(record)
+
+    @classmethod
+    def from_dict(cls, record):
+        return record if isinstance(record, cls) else cls(record)
+
+    def to_dict(self):
+        record = dict(self.items())
+        if isinstance(record.get('certificate_documents'), tuple):
+            record['certificate_documents'] = list(record['certificate_documents'])
+        return record
+
+    def update(self, changes):
+        # Inlined __setitem__: this runs for every field of every record loaded
+        fields, interned, intern = self.FIELDS, self.INTERNED_FIELDS, sys.intern
+        for key, value in changes.items():
+            if key in interned:
+                if type(value) is str:
+                    value = intern(value)
+            elif key == 'certificate_documents' and type(value) is list:
+                value = tuple(intern(d) if type(d) is str else d for d in value)
+            if key in fields:
+                setattr(self, key, value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self.FIELDS:
+            return getattr(self, key, default)
+        return self.extra.get(key, default) if self.extra else default
+
+    def keys(self):
+        return [f for f in APPLICATION_FIELDS if hasattr(self, f)] + list(self.extra or ())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __contains__(self, key):
+        return key in self.FIELDS and hasattr(self, key) or bool(self.extra) and key in self.extra
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return f"Application({self.to_dict()!r})"
+
+class JsonLogBackend:
+    """JSON snapshot plus an append-only transition log.
+
+    Every change since the last snapshot is one line in the log, e.g.
+    {"app_number": ..., "stage": "block", "status": "approve", "timestamp": ...}
+    or {"app_number": ..., "stage": "submitted", "record": {...}} for a new
+    application. The snapshot is only re-read when the file's inode, mtime or
+    size changes, and log lines written by other workers are picked up
+    incrementally from the last offset. The snapshot is written with the
+    given codec (see encode_snapshot) and read back with whichever wrote it.
+    """
+
+    def __init__(self, applications_file, log_file, legacy_verified_file=None, compact_every=1000, codec='json'):
+        self.applications_file = applications_file
+        self.codec = codec
+        self.log_file = log_file
+        self.legacy_verified_file = legacy_verified_file
+        self.compact_every = compact_every
+        self._snapshot_signature = None
+        self._log_inode = None
+        self._log_offset = 0
+        self._log_entries = 0
+
+    def changes(self):
+        """Return (snapshot, events); snapshot is the list of applications when the view must be rebuilt"""
+        snapshot = None
+        snapshot_signature = file_signature(self.applications_file)
+        log_signature = file_signature(self.log_file)
+        log_replaced = log_signature is not None and (
+            self._log_inode not in (None, log_signature[0]) or log_signature[2] < self._log_offset)
+        if snapshot_signature != self._snapshot_signature or log_replaced:
+            self._snapshot_signature = snapshot_signature
+            snapshot = load_snapshot(self.applications_file)
+            self._log_inode = None
+            self._log_offset = 0
+            self._log_entries = 0
+        events = []
+        if log_signature is not None and log_signature[2] > self._log_offset:
+            events = self._read_log()
+        return snapshot, events
+
+    def _read_log(self):
+        with open(self.log_file, 'rb') as fp:
+            self._log_inode = os.fstat(fp.fileno()).st_ino
+            fp.seek(self._log_offset)
+            chunk = fp.read()
+        # Ignore a trailing partial line; it is picked up once it is complete
+        end = chunk.rfind(b'\n') + 1
+        events = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                # One damaged line (e.g. an append cut short by an older build)
+                # must not keep every worker from loading the rest of the log
+                app.logger.warning("Skipping unreadable line in %s: %r", self.log_file, line[:200])
+        self._log_offset += end
+        self._log_entries += len(events)
+        return events
+
+    def locked(self):
+        return file_lock(self.log_file)
+
+    def data_version(self):
+        """Token that changes whenever the stored data may have changed"""
+        return f"{self._snapshot_signature}:{self._log_inode}:{self._log_offset}"
+
+    def append(self, events):
+        """Append events with a single write and fsync; callers hold locked()
+
+        A partial last line left by a crash mid-append is cut off first, so
+        the new events start on a line of their own.
+        """
+        data = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in events).encode('utf-8')
+        with open(self.log_file, 'ab+') as fp:
+            size = fp.seek(0, os.SEEK_END)
+            if size:
+                fp.seek(size - 1)
+                if fp.read(1) != b'\n':
+                    fp.truncate(self._line_start(fp, size))
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+    @staticmethod
+    def _line_start(fp, size, block=65536):
+        """Offset just past the last newline before size, or 0"""
+        end = size
+        while end > 0:
+            start = max(0, end - block)
+            fp.seek(start)
+            newline = fp.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+        return 0
+
+    def needs_compaction(self):
+        return self._log_entries >= self.compact_every
+
+    def compact(self, apps):
+        """Write a new snapshot, then swap in an empty log; callers hold locked()
+
+        The log is replaced rather than truncated so readers see a new inode
+        and rebuild from the new snapshot, which is already in place.
+        """
+        save_snapshot(self.applications_file, [a.to_dict() for a in apps], self.codec)
+        atomic_write(self.log_file, '')
+        self._snapshot_signature = file_signature(self.applications_file)
+        self._log_inode = file_signature(self.log_file)[0]
+        self._log_offset = 0
+        self._log_entries = 0
+
+    def legacy_verified(self):
+        """Full copies of verified applications kept by older versions in verified_certificates.json"""
+        return load_json(self.legacy_verified_file) if self.legacy_verified_file else []
+
+    def clear_legacy_verified(self):
+        if self.legacy_verified_file and os.path.exists(self.legacy_verified_file):
+            save_json(self.legacy_verified_file, [])
+
+class SqliteBackend:
+    """Applications in a SQLite database (WAL mode).
+
+    Every write bumps meta.version and stamps the rows it touches with it, so
+    each worker's view only fetches rows changed since the version it last
+    saw; several gunicorn workers can share one database. Deleting rows
+    (archival) also bumps meta.generation, which makes views reload.
+    """
+
+    STATUS_FIELDS = [f for f in APPLICATION_FIELDS if f.endswith('_status')]
+
+    def __init__(self, database):
+        self.database = database
+        self._version = None
+        self._generation = None
+        self.conn = sqlite3.connect(database, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+    def _create_schema(self):
+        columns = ', '.join(f'{f} TEXT' for f in APPLICATION_FIELDS[1:])
+        statements = [
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)",
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)",
+            f"CREATE TABLE IF NOT EXISTS applications (app_number TEXT PRIMARY KEY, {columns}, version INTEGER NOT NULL DEFAULT 0)",
+            "CREATE INDEX IF NOT EXISTS idx_applications_roll_number ON applications (roll_number)",
+            "CREATE INDEX IF NOT EXISTS idx_applications_roll_certificate ON applications (roll_number, certificate_type)",
+            "CREATE INDEX IF NOT EXISTS idx_applications_submission_time ON applications (submission_time)",
+            "CREATE INDEX IF NOT EXISTS idx_applications_verified_time ON applications (verified_time)",
+            "CREATE INDEX IF NOT EXISTS idx_applications_version ON applications (version)",
+        ]
+        statements += [f"CREATE INDEX IF NOT EXISTS idx_applications_{f} ON applications ({f})" for f in self.STATUS_FIELDS]
+        for statement in statements:
+            self.conn.execute(statement)
+
+    @staticmethod
+    def _to_row(record):
+        row = [record.get(f) for f in APPLICATION_FIELDS]
+        row[APPLICATION_FIELDS.index('certificate_documents')] = json.dumps(record.get('certificate_documents') or [])
+        return row
+
+    @staticmethod
+    def _from_row(row):
+        record = {f: row[f] for f in APPLICATION_FIELDS}
+        record['certificate_documents'] = json.loads(record['certificate_documents'] or '[]')
+        return record
+
+    def _select(self, table, version):
+        rows = self.conn.execute(f"SELECT * FROM {table} WHERE version > ? ORDER BY version, rowid", (version,))
+        return [self._from_row(r) for r in rows]
+
+    def current_version(self):
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def changes(self):
+        meta = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+        version, generation = meta['version'], meta['generation']
+        if version == self._version:
+            return None, []
+        if self._version is None or generation != self._generation:
+            self._version, self._generation = version, generation
+            return self._select('applications', -1), []
+        events = [{'app_number': r['app_number'], 'stage': 'stored', 'record': r}
+                  for r in self._select('applications', self._version)]
+        self._version = version
+        return None, events
+
+    def _bump_version(self):
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        return self.current_version()
+
+    def append(self, events):
+        fields = ', '.join(APPLICATION_FIELDS)
+        placeholders = ', '.join('?' for _ in APPLICATION_FIELDS)
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            version = self._bump_version()
+            for e in events:
+                if e['stage'] in ('submitted', 'stored'):
+                    verb = 'INSERT OR IGNORE' if e['stage'] == 'submitted' else 'INSERT OR REPLACE'
+                    self.conn.execute(
+                        f"{verb} INTO applications ({fields}, version) VALUES ({placeholders}, ?)",
+                        self._to_row(e['record']) + [version])
+                    continue
+                if e['stage'] == 'archived':
+                    self.conn.execute("DELETE FROM applications WHERE app_number = ?", (e['app_number'],))
+                    self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                    continue
+                row = self.conn.execute("SELECT certificate_type FROM applications WHERE app_number = ?", (e['app_number'],)).fetchone()
+                if row is None:
+                    continue
+                assignments = WORKFLOW.transition(e['stage'], row['certificate_type'], e['status'], e['timestamp'])
+                self.conn.execute(
+                    f"UPDATE applications SET {', '.join(f'{k} = ?' for k in assignments)}, version = ? WHERE app_number = ?",
+                    list(assignments.values()) + [version, e['app_number']])
+
+    def locked(self):
+        return file_lock(self.database)
+
+    def data_version(self):
+        return str(self._version)
+
+    def needs_compaction(self):
+        return False
+
+    def compact(self, apps):
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def _has_legacy_table(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'verified_certificates'").fetchone() is not None
+
+    def legacy_verified(self):
+        """Full copies of verified applications kept by older versions in the verified_certificates table"""
+        return self._select('verified_certificates', -1) if self._has_legacy_table() else []
+
+    def clear_legacy_verified(self):
+        if self._has_legacy_table():
+            self.conn.execute('DROP TABLE verified_certificates')
+
+class ApplicationArchive:
+    """Cold tier for verified applications moved out of the hot store.
+
+    Archived applications are added to gzip JSON Lines files, one per
+    month of verification (verified-YYYY-MM.jsonl.gz), and listed in
+    index.json with the fields that lookups by app_number and roll_number,
+    the duplicate check and the dashboard counters need, so only the
+    partition holding a requested record is ever decompressed. Each write
+    replaces a partition whole, so readers never see a half-written one.
+    Callers writing to the archive hold the store's backend lock.
+    """
+
+    INDEX_FIELDS = ('app_number', 'roll_number', 'certificate_type', 'degree_type', 'submission_date', 'partition')
+    CACHED_PARTITIONS = 4
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_file = os.path.join(directory, 'index.json')
+        self._signature = None
+        self._entries = {}
+        self._by_roll = {}
+        self._keys = set()
+        self._certificate_types = Counter()
+        self._degree_types = Counter()
+        self._partitions = {}
+
+    def _refresh(self):
+        signature = file_signature(self.index_file)
+        if signature == self._signature:
+            return
+        self._signature = signature
+        self._entries = {}
+        self._by_roll = {}
+        self._keys = set()
+        self._certificate_types = Counter()
+        self._degree_types = Counter()
+        for entry in load_json(self.index_file):
+            self._entries[entry['app_number']] = entry
+            self._by_roll.setdefault(entry['roll_number'], []).append(entry)
+            self._keys.add((entry['roll_number'], entry['certificate_type']))
+            self._certificate_types[entry['certificate_type']] += 1
+            self._degree_types[entry['degree_type']] += 1
+
+    def _partition_file(self, partition):
+        return os.path.join(self.directory, f"verified-{partition}.jsonl.gz")
+
+    def _partition(self, partition):
+        """Records of one partition by app_number; the last copy of a record wins"""
+        path = self._partition_file(partition)
+        signature = file_signature(path)
+        cached = self._partitions.pop(partition, None)
+        if cached is None or cached[0] != signature:
+            records = {}
+            if signature is not None:
+                with gzip.open(path, 'rt', encoding='utf-8') as fp:
+                    try:
+                        for line in fp:
+                            if line.strip():
+                                record = Application(json.loads(line))
+                                records[record['app_number']] = record
+                    except EOFError:
+                        # A last member cut short by a crash while appending in place,
+                        # before partitions were replaced whole. Its records were never
+                        # indexed, so they are still in the hot store.
+                        pass
+            cached = (signature, records)
+        self._partitions[partition] = cached
+        while len(self._partitions) > self.CACHED_PARTITIONS:
+            self._partitions.pop(next(iter(self._partitions)))
+        return cached[1]
+
+    def _records(self, entries):
+        return [self._partition(e['partition']).get(e['app_number']) for e in entries]
+
+    def add(self, records):
+        """Append records to their monthly partitions, then publish them in the index"""
+        self._refresh()
+        os.makedirs(self.directory, exist_ok=True)
+        partitions = {}
+        for a in records:
+            partitions.setdefault(a['verified_time'][:7], []).append(a)
+        for partition, batch in partitions.items():
+            # Rewritten from the records read back, so a partition damaged by an
+            # in-place append is repaired rather than extended past the damage
+            kept = dict(self._partition(partition))
+            kept.update((a['app_number'], a) for a in batch)
+            data = ''.join(json.dumps(a.to_dict(), ensure_ascii=False) + '\n' for a in kept.values()).encode('utf-8')
+            atomic_write(self._partition_file(partition), gzip.compress(data))
+        entries = dict(self._entries)
+        for a in records:
+            entries[a['app_number']] = {
+                'app_number': a['app_number'],
+                'roll_number': a.get('roll_number'),
+                'certificate_type': a.get('certificate_type'),
+                'degree_type': a.get('degree_type'),
+                'submission_date': (a.get('submission_time') or '')[:10],
+                'partition': a['verified_time'][:7],
+            }
+        atomic_write(self.index_file, json.dumps(list(entries.values()), ensure_ascii=False, separators=(',', ':')))
+
+    def get(self, app_number):
+        self._refresh()
+        entry = self._entries.get(app_number)
+        return self._records([entry])[0] if entry else None
+
+    def find_by_roll(self, roll_number):
+        self._refresh()
+        return self._records(self._by_roll.get(roll_number, []))
+
+    def has_key(self, roll_number, certificate_type):
+        self._refresh()
+        return (roll_number, certificate_type) in self._keys
+
+    def submitted_between(self, from_date, to_date):
+        self._refresh()
+        entries = [e for e in self._entries.values() if from_date <= e['submission_date'] <= to_date]
+        entries.sort(key=lambda e: e['partition'])
+        return self._records(entries)
+
+    def stats(self):
+        self._refresh()
+        return {
+            'total': len(self._entries),
+            'certificate_types': self._certificate_types,
+            'degree_types': self._degree_types,
+        }
+
+class QueueSubscription:
+    """Changes to one stage's queue, buffered until the subscriber's stream collects them"""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self._events = []
+        self._ready = threading.Condition()
+
+    def put(self, event):
+        with self._ready:
+            self._events.append(event)
+            self._ready.notify()
+
+    def get(self, timeout):
+        """Events published since the last call, waiting up to timeout seconds for the first"""
+        with self._ready:
+            if not self._events:
+                self._ready.wait(timeout)
+            events, self._events = self._events, []
+            return events
+
+def queue_row(a):
+    """Fields of an application shown in a stage dashboard row"""
+    return {f: a.get(f) for f in ('app_number', 'student_name', 'roll_number', 'certificate_type', 'submission_time')}
+
+class ApplicationStore:
+    """Materialized view of applications.
+
+    The view is kept in memory and brought up to date from the storage
+    backend on each access; new applications and stage approvals are written
+    to the backend as transition events and then applied to the view.
+    Each application is stored once: it counts as a verified certificate
+    once it has a verified_time, at which point it moves out of the pending
+    set into the verified indexes. Dict indexes by app_number and roll_number
+    are maintained on every change, so single-record lookups do not scan,
+    together with the set of (roll_number, certificate_type) keys used by the
+    duplicate check. Each stage also has a work queue of the
+    applications waiting in it (see Workflow), moved along incrementally
+    as transitions are applied. Submission dates are indexed as per-day
+    buckets plus a sorted list of days, so date lookups bisect to the
+    matching days instead of scanning. Lower-cased student names and roll
+    numbers are indexed by trigram (posting lists of record ids) for the
+    dashboard search, and running counters back the dashboard statistics.
+    With an archive, old verified applications are moved out to it on
+    compaction and lookups by app_number or roll_number, the duplicate check,
+    date ranges and the counters fall through to it.
+    Student status lookups are cached per roll_number (see status) and
+    dropped when an application with that roll number changes. Subscribers
+    to a stage (see subscribe) are told of every application that joins or
+    leaves its queue, whichever worker made the change.
+    Records are held as Application objects, which read like dicts; records
+    and lists returned are shared and must not be mutated.
+    """
+
+    def __init__(self, backend, archive=None):
+        self.backend = backend
+        self.archive = archive
+        self._lock = threading.RLock()
+        self._commit_lock = threading.Lock()
+        self._commit_queue = []
+        self._committing = False
+        self._subscribers = {key: set() for key in WORKFLOW.order}
+        self._rebuild([])
+
+    def _rebuild(self, apps):
+        self._apps = []
+        self._by_number = {}
+        self._by_roll = {}
+        self._pending = {}
+        self._verified_by_number = {}
+        self._verified_by_roll = {}
+        self._duplicate_keys = set()
+        self._queues = {key: {} for key in WORKFLOW.order}
+        self._stage_of = {}
+        self._by_day = {}
+        self._days = []
+        self._search_ids = {}
+        self._search_records = []
+        self._trigrams = {}
+        self._certificate_types = Counter()
+        self._degree_types = Counter()
+        self._status_cache = {}
+        # Records the indexes cannot hold (see malformed_fields), kept only so
+        # compaction writes them back rather than dropping stored data
+        self._malformed = []
+        for a in apps:
+            self._index(a, publish=False)
+
+    def _index(self, a, publish=True):
+        """Add an application to every index; a malformed record is left out entirely, never half-indexed"""
+        a = Application.from_dict(a)
+        if malformed_fields(a):
+            self._keep_malformed(a)
+            return
+        self._status_cache.pop(a.get('roll_number'), None)
+        self._apps.append(a)
+        self._by_number[a.get('app_number')] = a
+        self._by_roll.setdefault(a.get('roll_number'), []).append(a)
+        self._duplicate_keys.add((a.get('roll_number'), a.get('certificate_type')))
+        self._certificate_types[a.get('certificate_type')] += 1
+        self._degree_types[a.get('degree_type')] += 1
+        self._file(a)
+        self._requeue(a, publish)
+        self._index_day(a)
+        self._index_search(a)
+
+    def _keep_malformed(self, a):
+        app.logger.warning("Leaving application %r out of the view: malformed %s",
+                           a.get('app_number'), ', '.join(malformed_fields(a)))
+        self._malformed.append(a)
+
+    def _file(self, a):
+        """Keep an application in either the pending set or the verified indexes"""
+        app_number = a.get('app_number')
+        if not a.get('verified_time'):
+            self._pending[app_number] = a
+            return
+        self._pending.pop(app_number, None)
+        if app_number not in self._verified_by_number:
+            self._verified_by_number[app_number] = a
+            self._verified_by_roll.setdefault(a.get('roll_number'), []).append(a)
+
+    def _unfile_verified(self, a):
+        app_number = a.get('app_number')
+        if self._verified_by_number.pop(app_number, None) is not None:
+            self._verified_by_roll[a.get('roll_number')].remove(a)
+
+    def _index_day(self, a):
+        day = (a.get('submission_time') or '')[:10]
+        if day not in self._by_day:
+            self._by_day[day] = {}
+            bisect.insort(self._days, day)
+        self._by_day[day][a.get('app_number')] = a
+
+    def _index_search(self, a):
+        if a.get('app_number') in self._search_ids:
+            return
+        record_id = len(self._search_records)
+        self._search_ids[a.get('app_number')] = record_id
+        self._search_records.append(a)
+        # NUL keeps trigrams from spanning the name and the roll number
+        for trigram in trigrams(f"{(a.get('student_name') or '').lower()}\0{(a.get('roll_number') or '').lower()}"):
+            postings = self._trigrams.get(trigram)
+            if postings is None:
+                postings = self._trigrams[trigram] = array('I')
+            postings.append(record_id)
+
+    def _requeue(self, a, publish=True):
+        """Move an application to the queue of the stage it now waits in"""
+        app_number = a.get('app_number')
+        old = self._stage_of.pop(app_number, None)
+        if old:
+            self._queues[old].pop(app_number, None)
+        new = WORKFLOW.pending_stage(a)
+        if new:
+            self._queues[new][app_number] = a
+            self._stage_of[app_number] = new
+        if publish and old != new:
+            self._publish(old, new, a)
+
+    def _publish(self, old, new, a):
+        for subscription in self._subscribers.get(old, ()):
+            subscription.put({'type': 'remove', 'data': {'app_number': a.get('app_number')}})
+        for subscription in self._subscribers.get(new, ()):
+            subscription.put({'type': 'insert', 'data': queue_row(a)})
+
+    def subscribe(self, stage):
+        """Start collecting insert/remove events for a stage's queue; pair with unsubscribe"""
+        subscription = QueueSubscription(stage)
+        with self._lock:
+            self._subscribers[stage].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers[subscription.stage].discard(subscription)
+
+    def _refresh(self):
+        """Bring the view up to date with the backend"""
+        snapshot, events = self.backend.changes()
+        if snapshot is not None:
+            self._rebuild_and_publish(snapshot)
+        archived = set()
+        for event in events:
+            if event['stage'] == 'archived':
+                archived.add(event['app_number'])
+            else:
+                self._apply(event)
+        # Archival removes many records at once, so rebuild rather than unindex each
+        if archived:
+            self._rebuild_and_publish([a for a in self._apps if a.get('app_number') not in archived] + self._malformed)
+
+    def _rebuild_and_publish(self, apps):
+        """Rebuild the view, then tell subscribers only about queue membership that actually changed"""
+        if not any(self._subscribers.values()):
+            self._rebuild(apps)
+            return
+        before = dict(self._stage_of)
+        old_apps = self._by_number
+        self._rebuild(apps)
+        for app_number in before.keys() | self._stage_of.keys():
+            old, new = before.get(app_number), self._stage_of.get(app_number)
+            if old != new:
+                self._publish(old, new, self._by_number.get(app_number) or old_apps[app_number])
+
+    def _apply(self, event):
+        """Apply one transition event to the view; replaying an event twice is harmless"""
+        app_number = event['app_number']
+        if event['stage'] in ('submitted', 'stored'):
+            a = self._by_number.get(app_number)
+            if a is None:
+                self._index(event['record'])
+            elif event['stage'] == 'stored':
+                if malformed_fields(event['record']):
+                    self._keep_malformed(Application.from_dict(event['record']))
+                else:
+                    self._update(a, event['record'])
+            return
+        a = self._by_number.get(app_number)
+        if a is None:
+            return
+        self._update(a, WORKFLOW.transition(event['stage'], a.get('certificate_type'), event['status'], event['timestamp']))
+
+    def _update(self, a, changes):
+        """Change fields of an indexed application, keeping its queue and the pending/verified sets in step"""
+        self._status_cache.pop(a.get('roll_number'), None)
+        if a.get('verified_time') and not changes.get('verified_time', a['verified_time']):
+            self._unfile_verified(a)
+        a.update(changes)
+        self._file(a)
+        self._requeue(a)
+
+    def _accept(self, event, batch_keys):
+        """Whether an event may still be written once the backend lock is held
+
+        New applications are rejected if a field has a type the indexes cannot
+        hold or their (roll_number, certificate_type) key exists in the view or
+        earlier in the same batch, so concurrent submissions cannot both pass
+        the duplicate check; approvals are rejected unless the application is
+        waiting at that stage.
+        """
+        if event['stage'] == 'submitted':
+            record = event['record']
+            if malformed_fields(record):
+                return False
+            key = (record.get('roll_number'), record.get('certificate_type'))
+            if event['app_number'] in self._by_number or key in self._duplicate_keys or key in batch_keys \
+                    or (self.archive and self.archive.has_key(*key)):
+                return False
+            batch_keys.add(key)
+            return True
+        # Transitions only apply to applications waiting at that stage, once
+        key = (event['app_number'], event['stage'])
+        if self._stage_of.get(event['app_number']) != event['stage'] or key in batch_keys:
+            return False
+        batch_keys.add(key)
+        return True
+
+    def _commit(self, events):
+        """Write events to the backend, group-committing concurrent writers.
+
+        The first thread to arrive becomes the leader: it takes the backend's
+        cross-process lock, refreshes the view, checks each queued event with
+        _accept and writes all accepted events from every waiting thread in one
+        append. Returns one bool per event telling whether it was written.
+        """
+        entry = {'events': events, 'done': threading.Event(), 'accepted': None, 'error': None}
+        with self._commit_lock:
+            self._commit_queue.append(entry)
+            leader = not self._committing
+            self._committing = True
+        if leader:
+            self._lead_commits()
+        else:
+            entry['done'].wait()
+        if entry['error'] is not None:
+            raise entry['error']
+        return entry['accepted']
+
+    def _lead_commits(self):
+        while True:
+            with self._commit_lock:
+                batch, self._commit_queue = self._commit_queue, []
+                if not batch:
+                    self._committing = False
+                    return
+            try:
+                with self._lock, self.backend.locked():
+                    self._refresh()
+                    accepted = []
+                    batch_keys = set()
+                    for entry in batch:
+                        entry['accepted'] = [self._accept(e, batch_keys) for e in entry['events']]
+                        accepted += [e for e, ok in zip(entry['events'], entry['accepted']) if ok]
+                    if accepted:
+                        self.backend.append(accepted)
+                    self._refresh()
+                    if self.backend.needs_compaction():
+                        self._compact()
+            except Exception as e:
+                for entry in batch:
+                    entry['error'] = e
+            finally:
+                for entry in batch:
+                    entry['done'].set()
+
+    def _compact(self):
+        if self.archive:
+            self._archive(datetime.now() - ARCHIVE_AFTER)
+        self.backend.compact(self._apps + self._malformed)
+        self._refresh()
+
+    def _archive(self, before):
+        cutoff = before.strftime('%Y-%m-%d %H:%M:%S')
+        records = [a for a in self._verified_by_number.values() if a['verified_time'] < cutoff]
+        if records:
+            # Archive first: a crash in between leaves records in both tiers, never in neither
+            self.archive.add(records)
+            self.backend.append([{'app_number': a['app_number'], 'stage': 'archived'} for a in records])
+            self._refresh()
+        return len(records)
+
+    def archive_verified(self, before):
+        """Move applications verified before `before` (a datetime) to the archive; returns how many moved"""
+        with self._lock, self.backend.locked():
+            self._refresh()
+            return self._archive(before)
+
+    def compact(self):
+        """Fold outstanding transitions into the backend's snapshot"""
+        with self._lock, self.backend.locked():
+            self._refresh()
+            self._compact()
+
+    def collapse_legacy_verified(self):
+        """Fold the backend's legacy copies of verified certificates into the applications.
+
+        Safe to run repeatedly and from several workers at once; returns how
+        many applications were added or completed from the legacy copies.
+        """
+        with self._lock, self.backend.locked():
+            self._refresh()
+            legacy = self.backend.legacy_verified()
+            if not legacy:
+                return 0
+            records = merge_legacy_verified(self._by_number, legacy)
+            if records:
+                self.backend.append([{'app_number': r['app_number'], 'stage': 'stored', 'record': r} for r in records])
+                self._refresh()
+            self._compact()
+            self.backend.clear_legacy_verified()
+            return len(records)
+
+    def applications(self):
+        with self._lock:
+            self._refresh()
+            return self._apps
+
+    def verified(self):
+        with self._lock:
+            self._refresh()
+            return list(self._verified_by_number.values())
+
+    def stats(self):
+        """Dashboard counters, maintained incrementally as applications move through the stages"""
+        with self._lock:
+            self._refresh()
+            archived = self.archive.stats() if self.archive else {'total': 0, 'certificate_types': {}, 'degree_types': {}}
+            return {
+                'total': len(self._by_number) + archived['total'],
+                'pending': len(self._pending),
+                'verified': len(self._verified_by_number) + archived['total'],
+                'stages': {key: len(queue) for key, queue in self._queues.items()},
+                'certificate_types': count_labels(self._certificate_types + Counter(archived['certificate_types'])),
+                'degree_types': count_labels(self._degree_types + Counter(archived['degree_types'])),
+            }
+
+    def data_version(self):
+        """Opaque token identifying the current contents of the store, shared by all workers"""
+        with self._lock:
+            self._refresh()
+            return self.backend.data_version()
+
+    def queue(self, stage):
+        """Applications waiting at a stage, in the order they arrived there"""
+        with self._lock:
+            self._refresh()
+            return list(self._queues[stage].values())
+
+    def _in_scope(self, a, scope):
+        app_number = a.get('app_number')
+        if scope == 'verified':
+            return app_number in self._verified_by_number
+        if scope == 'pending':
+            return app_number in self._pending
+        return self._stage_of.get(app_number) == scope
+
+    def scope(self, scope):
+        """Applications in a dashboard scope: 'pending', 'verified' or a stage key"""
+        with self._lock:
+            self._refresh()
+            if scope == 'verified':
+                return list(self._verified_by_number.values())
+            if scope == 'pending':
+                return list(self._pending.values())
+            return self.queue(scope)
+
+    def _days_between(self, low, high):
+        return self._days[bisect.bisect_left(self._days, low):bisect.bisect_right(self._days, high)]
+
+    def submitted_between(self, from_date, to_date):
+        """Applications submitted from from_date to to_date (YYYY-MM-DD, inclusive), archived ones last"""
+        with self._lock:
+            self._refresh()
+            apps = [a for day in self._days_between(from_date, to_date)
+                    for a in self._by_day[day].values() if a.get('app_number') in self._by_number]
+            if self.archive:
+                apps += [a for a in self.archive.submitted_between(from_date, to_date) if a['app_number'] not in self._by_number]
+            return apps
+
+    def submitted_on(self, prefix, scope):
+        """Applications in scope whose submission_time starts with prefix (a date, month or timestamp)"""
+        with self._lock:
+            self._refresh()
+            days = self._days_between(prefix[:10], prefix[:10] + '\uffff') if len(prefix) < 10 else [prefix[:10]]
+            return [a for day in days for a in self._by_day.get(day, {}).values()
+                    if (a.get('submission_time') or '').startswith(prefix) and self._in_scope(a, scope)]
+
+    def search(self, query, scope):
+        """Applications in scope whose student name or roll number contains query (case-insensitive)
+
+        Candidates come from the posting list of the query's rarest trigram;
+        queries shorter than a trigram fall back to scanning the scope.
+        """
+        query = query.lower()
+        with self._lock:
+            self._refresh()
+            if len(query) < 3:
+                candidates = self.scope(scope)
+            else:
+                postings = [self._trigrams.get(t) for t in trigrams(query)]
+                if not all(postings):
+                    return []
+                candidates = [self._search_records[i] for i in min(postings, key=len)]
+            return [a for a in candidates
+                    if (query in (a.get('student_name') or '').lower() or query in (a.get('roll_number') or '').lower())
+                    and self._in_scope(a, scope)]
+
+    def get(self, app_number):
+        """Application by app_number, verified, pending or archived"""
+        with self._lock:
+            self._refresh()
+            return self._by_number.get(app_number) or self._get_archived(app_number)
+
+    def get_verified(self, app_number):
+        with self._lock:
+            self._refresh()
+            return self._verified_by_number.get(app_number) or self._get_archived(app_number)
+
+    def _get_archived(self, app_number):
+        return self.archive.get(app_number) if self.archive else None
+
+    def _find_archived(self, roll_number):
+        if not self.archive:
+            return []
+        return [a for a in self.archive.find_by_roll(roll_number) if a['app_number'] not in self._by_number]
+
+    def find_by_roll(self, roll_number):
+        with self._lock:
+            self._refresh()
+            return self._by_roll.get(roll_number, []) + self._find_archived(roll_number)
+
+    def find_verified_by_roll(self, roll_number):
+        with self._lock:
+            self._refresh()
+            return self._verified_by_roll.get(roll_number, []) + self._find_archived(roll_number)
+
+    def status(self, roll_number):
+        """(application, etag, last_modified) for a student's status lookup by roll_number
+
+        The application is the first found for the roll number, or None. The
+        ETag hashes its contents and last_modified is its latest timestamp, so
+        an unchanged application can be answered with 304 Not Modified.
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._status_cache.pop(roll_number, None)
+            if entry is None:
+                matches = self.find_by_roll(roll_number)
+                entry = status_entry(matches[0] if matches else None)
+            self._status_cache[roll_number] = entry
+            if len(self._status_cache) > STATUS_CACHE_SIZE:
+                self._status_cache.pop(next(iter(self._status_cache)))
+            return entry
+
+    def is_duplicate(self, roll_number, certificate_type):
+        with self._lock:
+            self._refresh()
+            return (roll_number, certificate_type) in self._duplicate_keys \
+                or bool(self.archive and self.archive.has_key(roll_number, certificate_type))
+
+    def add(self, record):
+        """Store a new application; returns False if it duplicates an existing one"""
+        return self._commit([{'app_number': record['app_number'], 'stage': 'submitted', 'record': record}])[0]
+
+    def transition(self, app_number, stage):
+        """Record approval of an application at a stage; returns False if it is not waiting there"""
+        return self.transition_many([app_number], stage) == 1
+
+    def transition_many(self, app_numbers, stage):
+        """Approve several applications at a stage with a single write; returns how many moved on"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        events = [{'app_number': n, 'stage': stage, 'status': STAGES[stage]['approved'], 'timestamp': timestamp}
+                  for n in dict.fromkeys(app_numbers)]
+        return sum(self._commit(events)) if events else 0
+
+def status_entry(a):
+    """Status cache entry for an application (or None): the record, its ETag and Last-Modified time"""
+    if a is None:
+        return None, 'none', None
+    etag = hashlib.sha1(json.dumps(a.to_dict(), sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+    times = [a.get(f) for f in APPLICATION_FIELDS if f.endswith('_time') and a.get(f)]
+    try:
+        # Timestamps are stored in server local time
+        last_modified = datetime.strptime(max(times), '%Y-%m-%d %H:%M:%S').astimezone(timezone.utc) if times else None
+    except ValueError:
+        last_modified = None
+    return a, etag, last_modified
+
+def merge_legacy_verified(by_number, legacy):
+    """Records to store so that legacy verified copies are no longer needed
+
+    A legacy copy whose application is missing is stored as the application;
+    one whose application lacks fields the copy has (such as verified_time)
+    fills them in. Applications that already have everything are skipped.
+    """
+    records = {}
+    for v in legacy:
+        app_number = v.get('app_number')
+        a = records.get(app_number) or by_number.get(app_number)
+        if a is None:
+            records[app_number] = dict(v)
+            continue
+        missing = {k: value for k, value in v.items() if value and not a.get(k)}
+        if missing:
+            records[app_number] = {**a, **missing}
+    return list(records.values())
+
+def create_backend():
+    if STORAGE_BACKEND == 'sqlite':
+        return SqliteBackend(SQLITE_DATABASE)
+    return JsonLogBackend(APPLICATIONS_FILE, APPLICATIONS_LOG_FILE, VERIFIED_CERTIFICATES_FILE, codec=SNAPSHOT_CODEC)
+
+def migrate_json_to_sqlite(database):
+    """Copy applications.json, any pending log entries and legacy verified certificates into SQLite"""
+    source = JsonLogBackend(APPLICATIONS_FILE, APPLICATIONS_LOG_FILE, VERIFIED_CERTIFICATES_FILE)
+    view = ApplicationStore(source)
+    apps = view.applications()
+    records = {a['app_number']: a for a in apps}
+    records.update((r['app_number'], r) for r in merge_legacy_verified(records, source.legacy_verified()))
+    backend = SqliteBackend(database)
+    with backend.locked():
+        backend.append([{'app_number': n, 'stage': 'stored', 'record': r} for n, r in records.items()])
+    return len(records), sum(1 for r in records.values() if r.get('verified_time'))
+
+store = ApplicationStore(create_backend(), ApplicationArchive(ARCHIVE_DIR))
+
+@app.cli.command('migrate-sqlite')
+def migrate_sqlite_command():
+    """Migrate the JSON files into the SQLite database"""
+    apps, verified = migrate_json_to_sqlite(SQLITE_DATABASE)
+    print(f"Migrated {apps} applications and {verified} verified certificates into {SQLITE_DATABASE}")
+
+@app.cli.command('archive-verified')
+def archive_verified_command():
+    """Move applications verified more than ARCHIVE_AFTER ago into the archive"""
+    moved = store.archive_verified(datetime.now() - ARCHIVE_AFTER)
+    print(f"Archived {moved} verified applications into {ARCHIVE_DIR}")
+
+@app.cli.command('migrate-verified')
+def migrate_verified_command():
+    """Fold verified_certificates copies into the applications and clear them"""
+    print(f"Merged {store.collapse_legacy_verified()} verified certificates into the applications")
 
 def gen_app_number():
     return f"SKD{datetime.now().strftime('%Y%m%d')}{uuid.uuid4().hex[:6].upper()}"
 
+TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\Z')
+
 def format_datetime(dt_string):
     """Format datetime string to readable format"""
     if not dt_string or dt_string == 'Waiting for previous steps':
         return 'Waiting for previous steps'
+    # Stored timestamps are already in the display format; parsing them would only round-trip
+    if isinstance(dt_string, str) and TIMESTAMP_RE.match(dt_string):
+        return dt_string
     try:
         if isinstance(dt_string, str):
             dt = datetime.strptime(dt_string, '%Y-%m-%d %H:%M:%S')
@@ -51,212 +1374,63 @@ def format_datetime(dt_string):
 
 def check_duplicate_application(roll_number, certificate_type):
     """Check if application with same hall ticket and certificate type already exists"""
-    apps = load_json(APPLICATIONS_FILE)
-    verified = load_json(VERIFIED_CERTIFICATES_FILE)
-    
-    # Check in pending applications
-    for app in apps:
-        if (app.get('roll_number') == roll_number and 
-            app.get('certificate_type') == certificate_type):
-            return True
-    
-    # Check in verified certificates
-    for cert in verified:
-        if (cert.get('roll_number') == roll_number and 
-            cert.get('certificate_type') == certificate_type):
-            return True
-    
-    return False
+    return store.is_duplicate(roll_number, certificate_type)
 
 def build_timeline(app):
-    """Build enhanced modern timeline with proper formatting and status indicators"""
-    timeline = []
-    
-    # Application Submitted
-    submission_time = app.get('submission_time', '')
-    timeline.append({
-        'stage': 'Application Submitted', 
-        'status': 'Completed', 
+    """Timeline of an application's progress: submission, one step per stage, then verification.
+
+    Timelines are memoized on the fields that change as the application
+    moves through the workflow, so repeated portal lookups of an unchanged
+    application reuse the same (shared, read-only) list.
+    """
+    return _timeline(app.get('app_number'), app.get('certificate_type', 'Certificate'), app.get('submission_time', ''),
+                     tuple((key, app.get(STAGES[key]['status_field']), app.get(STAGES[key]['time_field']))
+                           for key in WORKFLOW.path(app.get('certificate_type'))),
+                     app.get('verified_time'))
+
+@lru_cache(maxsize=4096)
+def _timeline(app_number, certificate_type, submission_time, stages, verified_time):
+    timeline = [{
+        'stage': 'Application Submitted',
+        'status': 'Completed',
         'timestamp': format_datetime(submission_time),
         'css_class': 'completed',
         'icon': 'fa-paper-plane',
-        'description': f"{app.get('certificate_type', 'Certificate')} application submitted successfully",
+        'description': f"{certificate_type} application submitted successfully",
         'step': 1
+    }]
+    for step, (key, status, time) in enumerate(stages, start=2):
+        stage = STAGES[key]
+        if time and status:
+            approved = status == stage['approved']
+            timeline.append({
+                'stage': stage['name'],
+                'status': stage['done_status'] if approved else status.title(),
+                'timestamp': format_datetime(time),
+                'css_class': 'completed' if approved else 'pending',
+                'icon': stage['icon'],
+                'description': stage['done_description'],
+                'step': step
+            })
+        else:
+            timeline.append({
+                'stage': stage['name'],
+                'status': 'Pending',
+                'timestamp': 'Waiting for previous steps',
+                'css_class': 'pending',
+                'icon': stage['icon'],
+                'description': stage['waiting_description'],
+                'step': step
+            })
+    timeline.append({
+        'stage': 'Verified Certificate',
+        'status': 'Approved' if verified_time else 'Pending',
+        'timestamp': format_datetime(verified_time) if verified_time else 'Waiting for previous steps',
+        'css_class': 'completed' if verified_time else 'pending',
+        'icon': 'fa-certificate',
+        'description': 'Certificate has been verified and is available for viewing' if verified_time else 'Certificate is not yet verified',
+        'step': len(timeline) + 1
     })
-    
-    # Block Office
-    verification_time = app.get('verification_time')
-    verification_status = app.get('verification_status')
-    if verification_time and verification_status:
-        status_text = 'Approved' if verification_status == 'approve' else verification_status.title()
-        timeline.append({
-            'stage': 'Block Office', 
-            'status': status_text, 
-            'timestamp': format_datetime(verification_time),
-            'css_class': 'completed' if verification_status == 'approve' else 'pending',
-            'icon': 'fa-building',
-            'description': 'Document verification completed',
-            'step': 2
-        })
-    else:
-        timeline.append({
-            'stage': 'Block Office', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-building',
-            'description': 'Waiting for document verification',
-            'step': 2
-        })
-    
-    # Computer Session
-    computer_session_time = app.get('computer_session_time')
-    computer_session_status = app.get('computer_session_status')
-    if computer_session_time and computer_session_status:
-        status_text = 'Approved' if computer_session_status == 'approved' else computer_session_status.title()
-        timeline.append({
-            'stage': 'Computer Session', 
-            'status': status_text, 
-            'timestamp': format_datetime(computer_session_time),
-            'css_class': 'completed' if computer_session_status == 'approved' else 'pending',
-            'icon': 'fa-laptop',
-            'description': 'Digital processing completed',
-            'step': 3
-        })
-    else:
-        timeline.append({
-            'stage': 'Computer Session', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-laptop',
-            'description': 'Waiting for computer processing',
-            'step': 3
-        })
-    
-    # Re-Block Queue
-    reblock_time = app.get('reblock_time')
-    reblock_status = app.get('reblock_status')
-    if reblock_time and reblock_status:
-        status_text = 'Completed' if reblock_status == 'approved' else reblock_status.title()
-        timeline.append({
-            'stage': 'Re-Block Queue', 
-            'status': status_text, 
-            'timestamp': format_datetime(reblock_time),
-            'css_class': 'completed' if reblock_status == 'approved' else 'pending',
-            'icon': 'fa-redo',
-            'description': 'Re-blocking process completed',
-            'step': 4
-        })
-    else:
-        timeline.append({
-            'stage': 'Re-Block Queue', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-redo',
-            'description': 'Waiting for previous steps',
-            'step': 4
-        })
-    
-    # AR Session
-    ar_time = app.get('ar_time')
-    ar_status = app.get('ar_status')
-    if ar_time and ar_status:
-        status_text = 'Approved' if ar_status == 'approved' else ar_status.title()
-        timeline.append({
-            'stage': 'AR Session', 
-            'status': status_text, 
-            'timestamp': format_datetime(ar_time),
-            'css_class': 'completed' if ar_status == 'approved' else 'pending',
-            'icon': 'fa-cube',
-            'description': 'Augmented reality verification',
-            'step': 5
-        })
-    else:
-        timeline.append({
-            'stage': 'AR Session', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-cube',
-            'description': 'Waiting for previous steps',
-            'step': 5
-        })
-    
-    # VR Session
-    vr_time = app.get('vr_time')
-    vr_status = app.get('vr_status')
-    if vr_time and vr_status:
-        status_text = 'Approved' if vr_status == 'approved' else vr_status.title()
-        timeline.append({
-            'stage': 'VR Session', 
-            'status': status_text, 
-            'timestamp': format_datetime(vr_time),
-            'css_class': 'completed' if vr_status == 'approved' else 'pending',
-            'icon': 'fa-vr-cardboard',
-            'description': 'Virtual reality processing',
-            'step': 6
-        })
-    else:
-        timeline.append({
-            'stage': 'VR Session', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-vr-cardboard',
-            'description': 'Waiting for previous steps',
-            'step': 6
-        })
-    
-    # Post Session
-    post_time = app.get('post_time')
-    post_status = app.get('post_status')
-    if post_time and post_status:
-        post_status_text = 'Approved' if post_status == 'approved' else post_status.title()
-        timeline.append({
-            'stage': 'Post Session', 
-            'status': post_status_text, 
-            'timestamp': format_datetime(post_time),
-            'css_class': 'completed' if post_status == 'approved' else 'pending',
-            'icon': 'fa-mail-bulk',
-            'description': 'Final processing completed',
-            'step': 7
-        })
-    else:
-        timeline.append({
-            'stage': 'Post Session', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-mail-bulk',
-            'description': 'Waiting for previous steps',
-            'step': 7
-        })
-    
-    # Verified Certificates
-    verified_time = app.get('verified_time')
-    if verified_time:
-        timeline.append({
-            'stage': 'Verified Certificate', 
-            'status': 'Approved', 
-            'timestamp': format_datetime(verified_time),
-            'css_class': 'completed',
-            'icon': 'fa-certificate',
-            'description': 'Certificate has been verified and is available for viewing',
-            'step': 8
-        })
-    else:
-        timeline.append({
-            'stage': 'Verified Certificate', 
-            'status': 'Pending', 
-            'timestamp': 'Waiting for previous steps',
-            'css_class': 'pending',
-            'icon': 'fa-certificate',
-            'description': 'Certificate is not yet verified',
-            'step': 8
-        })
-
     return timeline
 
 def get_progress_percentage(timeline):
@@ -266,26 +1440,248 @@ def get_progress_percentage(timeline):
     return (completed_steps / total_steps) * 100 if total_steps > 0 else 0
 
 def get_current_stage(app):
-    if app.get('verified_time'): return 'Verified Certificates'
-    if app.get('post_status'): return 'Post Session'
-    if app.get('vr_status'): return 'VR Session'
-    if app.get('ar_status'): return 'AR Session'
-    if app.get('reblock_status'): return 'Re-Block Queue'
-    if app.get('computer_session_status'): return 'Computer Session'
-    if app.get('verification_status'): return 'Block Office'
-    return 'Application Submitted'
-
-def filter_apps(apps, search, date_filter):
-    filtered = apps
+    return WORKFLOW.current_stage(app)
+
+def filter_apps(scope, search, date_filter):
+    """Applications in scope ('pending', 'verified' or a stage key) matching the dashboard filters (unordered, see paginate)"""
     if search:
-        filtered = [a for a in filtered if search.lower() in a.get('student_name', '').lower() or search.lower() in a.get('roll_number', '').lower()]
-    if date_filter:
-        filtered = [a for a in filtered if a.get('submission_time', '').startswith(date_filter)]
-    return sorted(filtered, key=lambda x: x.get('submission_time', ''), reverse=True)
+        filtered = store.search(search, scope)
+        if date_filter:
+            filtered = [a for a in filtered if a.get('submission_time', '').startswith(date_filter)]
+    elif date_filter:
+        filtered = store.submitted_on(date_filter, scope)
+    else:
+        filtered = store.scope(scope)
+    return filtered
+
+def page_key(a):
+    return (a.get('submission_time') or '', a.get('app_number') or '')
+
+def paginate(apps, cursor=None, limit=PAGE_SIZE):
+    """Return (page, next_cursor) for apps ordered newest submission first.
+
+    The cursor is the "submission_time|app_number" key of the last row of the
+    previous page; only rows after it are considered and only the page is
+    ordered, using a bounded heap instead of sorting every match.
+    """
+    if cursor and '|' in cursor:
+        after = tuple(cursor.split('|', 1))
+        apps = (a for a in apps if page_key(a) < after)
+    page = heapq.nlargest(limit + 1, apps, key=page_key)
+    next_cursor = '|'.join(page_key(page[limit - 1])) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+def page_args():
+    """(cursor, limit) requested for the current listing"""
+    try:
+        limit = min(max(int(request.args.get('limit', PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        limit = PAGE_SIZE
+    return request.args.get('cursor'), limit
+
+def page_links(next_cursor):
+    """URLs of the next and first page of the current listing"""
+    args = request.args.to_dict()
+    args.pop('cursor', None)
+    return {
+        'next_url': url_for(request.endpoint, **args, cursor=next_cursor) if next_cursor else None,
+        'first_url': url_for(request.endpoint, **args),
+    }
+
+def export_row(app):
+    """Spreadsheet row for an application, keyed by column heading"""
+    return {
+        'Application Number': app.get('app_number', ''),
+        'Student Name': app.get('student_name', ''),
+        'Hall Ticket No': app.get('roll_number', ''),
+        'Certificate Type': app.get('certificate_type', ''),
+        'Degree Type': app.get('degree_type', ''),
+        'Program': app.get('sub_category', ''),
+        'Fee Option': app.get('fee_option_label', ''),
+        'Submitted Documents': ', '.join(app.get('certificate_documents', [])),
+        'Submission Time': app.get('submission_time', ''),
+        'Current Stage': get_current_stage(app),
+        'Block Office Status': app.get('verification_status', 'Pending'),
+        'Computer Session Status': app.get('computer_session_status', 'Pending'),
+        'Re-Block Status': app.get('reblock_status', 'Pending'),
+        'AR Session Status': app.get('ar_status', 'Pending'),
+        'VR Session Status': app.get('vr_status', 'Pending'),
+        'Post Session Status': app.get('post_status', 'Pending'),
+        'Verified': 'Yes' if app.get('verified_time') else 'No'
+    }
+
+EXPORT_COLUMNS = list(export_row({}))
+
+EXPORT_FORMATS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+def export_applications(from_date, to_date):
+    """Generator over applications submitted between two dates (YYYY-MM-DD, inclusive)"""
+    yield from store.submitted_between(from_date, to_date)
+
+def write_excel(apps, fp):
+    """Write apps to fp as an .xlsx one row at a time (openpyxl write-only mode)"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Applications')
+    header = []
+    for column in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(ws, value=column)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+    for app in apps:
+        ws.append(list(export_row(app).values()))
+    wb.save(fp)
+
+def csv_lines(apps, batch_size=500):
+    """CSV export, yielded in chunks of batch_size rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for i, app in enumerate(apps, 1):
+        writer.writerow(export_row(app).values())
+        if i % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def jsonl_lines(apps):
+    """JSON Lines export: one object per application, keyed by column heading"""
+    for app in apps:
+        yield json.dumps(export_row(app), ensure_ascii=False) + '\n'
+
+def write_parquet(apps, fp, batch_size=10000):
+    """Write apps to fp as Parquet, one row group per batch_size rows (needs pyarrow)"""
+    schema = pa.schema([(column, pa.string()) for column in EXPORT_COLUMNS])
+    with pq.ParquetWriter(fp, schema) as writer:
+        while True:
+            batch = [export_row(app) for app in itertools.islice(apps, batch_size)]
+            if not batch:
+                break
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+export_executor = ThreadPoolExecutor(max_workers=2)
+
+def export_job_path(job_id, suffix='json'):
+    return os.path.join(EXPORTS_DIR, f"{job_id}.{suffix}")
 
-def get_pending_apps(apps):
-    """Get only pending applications (not verified)"""
-    return [a for a in apps if not a.get('verified_time')]
+def load_export_job(job_id):
+    """Status of an export job, or None; stored on disk so any worker can answer.
+
+    A queued or running job whose worker process has exited (a restart or
+    deploy), or that has not saved progress for EXPORT_JOB_STALE, is marked
+    failed, so clients stop polling and the same request can start it again.
+    """
+    if not all(c in '0123456789abcdef' for c in job_id):
+        return None
+    try:
+        with open(export_job_path(job_id), 'r', encoding='utf-8') as fp:
+            job = json.load(fp)
+    except FileNotFoundError:
+        return None
+    if export_job_abandoned(job):
+        job.update(status='failed', error='Export was interrupted; request it again',
+                   finished_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        save_json(export_job_path(job_id), job)
+    return job
+
+def export_job_abandoned(job):
+    if job['status'] not in ('queued', 'running'):
+        return False
+    if job.get('owner_pid'):
+        try:
+            os.kill(job['owner_pid'], 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+    return time.time() - job.get('heartbeat', 0) > EXPORT_JOB_STALE.total_seconds()
+
+def save_export_job(job):
+    """Write a job's status; each save is also the owning worker's heartbeat"""
+    job['heartbeat'] = time.time()
+    save_json(export_job_path(job['job_id']), job)
+
+def prune_export_jobs():
+    """Remove job files and artifacts older than EXPORT_JOB_TTL; callers hold the jobs lock"""
+    cutoff = (datetime.now() - EXPORT_JOB_TTL).timestamp()
+    for name in os.listdir(EXPORTS_DIR):
+        path = os.path.join(EXPORTS_DIR, name)
+        if path == EXPORT_JOBS_LOCK + '.lock':
+            continue
+        # Running jobs rename their artifacts into place while this runs
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+def start_export_job(from_date, to_date, export_format):
+    """Queue an export, or return the existing job for the same request and unchanged data.
+
+    The job id hashes (from_date, to_date, format) with the store's data
+    version, so an identical request made while the data is unchanged maps
+    to the job (and artifact) that already exists. The check, pruning and
+    the new job file are made under one lock for the exports directory, so
+    of two identical requests from different workers only one starts the
+    export.
+    """
+    os.makedirs(EXPORTS_DIR, exist_ok=True)
+    key = json.dumps([from_date, to_date, export_format, store.data_version()])
+    job_id = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    with file_lock(EXPORT_JOBS_LOCK):
+        job = load_export_job(job_id)
+        if job and job['status'] != 'failed':
+            return job
+        prune_export_jobs()
+        job = {
+            'job_id': job_id, 'from_date': from_date, 'to_date': to_date, 'format': export_format,
+            'status': 'queued', 'rows_written': 0, 'total_rows': None, 'error': None,
+            'created_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'finished_time': None,
+            'owner_pid': os.getpid(),
+        }
+        save_export_job(job)
+    export_executor.submit(run_export_job, job)
+    return job
+
+def run_export_job(job, progress_every=1000):
+    def tracked(apps):
+        for i, app in enumerate(apps, 1):
+            yield app
+            if i % progress_every == 0:
+                job['rows_written'] = i
+                save_export_job(job)
+
+    path = export_job_path(job['job_id'], job['format'])
+    # A temp name of its own, so a rerun of the same job never writes into this one's file
+    fd, tmp = tempfile.mkstemp(dir=EXPORTS_DIR, prefix=f".{job['job_id']}.", suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            apps = list(export_applications(job['from_date'], job['to_date']))
+            job.update(status='running', total_rows=len(apps))
+            save_export_job(job)
+            if job['format'] == 'xlsx':
+                write_excel(tracked(apps), fp)
+            elif job['format'] == 'parquet':
+                write_parquet(tracked(apps), fp)
+            else:
+                lines = csv_lines(tracked(apps)) if job['format'] == 'csv' else jsonl_lines(tracked(apps))
+                for chunk in lines:
+                    fp.write(chunk.encode('utf-8'))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+        job.update(status='done', rows_written=len(apps))
+    except Exception as e:
+        job.update(status='failed', error=str(e))
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    job['finished_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    save_export_job(job)
 
 BASE = """<!DOCTYPE html>
 <html lang="en">
@@ -1098,7 +2494,7 @@ BASE = """<!DOCTYPE html>
           <button type="button" class="btn-close btn-close-white" data-bs-dismiss="modal" aria-label="Close"></button>
         </div>
         <div class="modal-body">
-          <form id="downloadForm" action="/admin/download_excel" method="post">
+          <form id="downloadForm" action="/admin/export" method="post">
             <div class="mb-3">
               <label for="fromDate" class="form-label">From Date</label>
               <input type="date" class="form-control" id="fromDate" name="from_date" required>
@@ -1107,11 +2503,24 @@ BASE = """<!DOCTYPE html>
               <label for="toDate" class="form-label">To Date</label>
               <input type="date" class="form-control" id="toDate" name="to_date" required>
             </div>
+            <div class="mb-3">
+              <label for="exportFormat" class="form-label">Format</label>
+              <select class="form-select" id="exportFormat" name="format">
+                <option value="xlsx">Excel (.xlsx)</option>
+                <option value="csv">CSV</option>
+                <option value="jsonl">JSON Lines</option>
+                {% if parquet_export %}
+                <option value="parquet">Parquet</option>
+                {% endif %}
+              </select>
+            </div>
           </form>
+          <div id="exportJobStatus" class="small text-muted"></div>
         </div>
         <div class="modal-footer">
           <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">Cancel</button>
-          <button type="submit" form="downloadForm" class="btn btn-primary">Download Excel</button>
+          <button type="button" class="btn btn-outline-primary" onclick="startExportJob()">Export in Background</button>
+          <button type="submit" form="downloadForm" class="btn btn-primary">Download</button>
         </div>
       </div>
     </div>
@@ -1233,6 +2642,98 @@ BASE = """<!DOCTYPE html>
       });
     });
     
+    // Select or clear every row for bulk approval
+    function toggleAllApps(source) {
+      document.querySelectorAll('input[name="app_numbers"]').forEach(checkbox => {
+        checkbox.checked = source.checked;
+      });
+    }
+    
+    {% if live_queues %}
+    // Live stage queues: patch the table from the stage's event stream instead of reloading
+    document.addEventListener('DOMContentLoaded', function() {
+      const table = document.querySelector('table[data-live-stage]');
+      const empty = document.querySelector('[data-live-empty]');
+      if (!window.EventSource || !(table || empty)) {
+        return;
+      }
+      const source = new EventSource(`/${table ? table.dataset.liveStage : empty.dataset.liveEmpty}/events`);
+      const findRow = appNumber => table && Array.from(table.tBodies[0].rows).find(row => row.dataset.appNumber === appNumber);
+      source.addEventListener('insert', event => {
+        const app = JSON.parse(event.data);
+        if (!table) {
+          window.location.reload();
+          return;
+        }
+        if (!('liveInsert' in table.dataset) || findRow(app.app_number)) {
+          return;
+        }
+        const row = document.getElementById('liveRowTemplate').content.firstElementChild.cloneNode(true);
+        row.dataset.appNumber = app.app_number;
+        row.dataset.key = `${app.submission_time}|${app.app_number}`;
+        row.querySelectorAll('[data-live-field]').forEach(cell => { cell.textContent = app[cell.dataset.liveField] || ''; });
+        row.querySelector('[data-live-value]').value = app.app_number;
+        row.querySelectorAll('[href], [action]').forEach(el => {
+          const attr = el.hasAttribute('href') ? 'href' : 'action';
+          el.setAttribute(attr, el.getAttribute(attr).replace('__APP_NUMBER__', encodeURIComponent(app.app_number)));
+        });
+        // Rows are newest first; a row older than the whole page belongs on a later page
+        const tbody = table.tBodies[0];
+        const next = Array.from(tbody.rows).find(other => other.dataset.key < row.dataset.key);
+        if (next) {
+          tbody.insertBefore(row, next);
+        } else if (!('hasNext' in table.dataset)) {
+          tbody.appendChild(row);
+        }
+      });
+      source.addEventListener('remove', event => {
+        const row = findRow(JSON.parse(event.data).app_number);
+        if (row) {
+          row.remove();
+        }
+      });
+      // Approve without a redirect and full page render; the stream removes the row
+      document.addEventListener('submit', event => {
+        const form = event.target;
+        if (!form.hasAttribute('data-live-approve')) {
+          return;
+        }
+        event.preventDefault();
+        fetch(form.action, { method: 'POST', headers: { 'X-Requested-With': 'fetch' } })
+          .then(response => {
+            hideLoading();
+            if (response.ok) {
+              form.closest('tr').remove();
+            }
+          });
+      });
+    });
+    {% endif %}
+    
+    // Queue a background export, poll its progress and download it when ready
+    function startExportJob() {
+      const form = document.getElementById('downloadForm');
+      const status = document.getElementById('exportJobStatus');
+      if (!form.reportValidity()) {
+        return;
+      }
+      const poll = job => {
+        if (job.status === 'done') {
+          status.textContent = `Export ready (${job.rows_written} rows)`;
+          window.location.href = job.download_url;
+        } else if (job.status === 'failed') {
+          status.textContent = `Export failed: ${job.error}`;
+        } else {
+          status.textContent = job.total_rows === null ? 'Export queued...' : `Exporting ${job.rows_written} / ${job.total_rows} rows...`;
+          setTimeout(() => fetch(job.status_url).then(response => response.json()).then(poll), 1000);
+        }
+      };
+      fetch('/admin/export_jobs', { method: 'POST', body: new FormData(form) })
+        .then(response => response.ok ? response.json() : response.text().then(text => Promise.reject(text)))
+        .then(poll)
+        .catch(error => { status.textContent = error; });
+    }
+    
     // Admin search function
     function adminSearch() {
       const hallTicket = document.getElementById('adminSearchInput').value;
@@ -1594,7 +3095,7 @@ STUDENT_PORTAL = """<div class="fade-in">
       <p class="text-muted">Enter your hall ticket number to track your application status</p>
     </div>
     
-    <form method="post" class="search-form">
+    <form method="post" action="{{ url_for('student_portal') }}" class="search-form">
       <div class="row g-3">
         <div class="col-md-9">
           <div class="input-group">
@@ -1682,7 +3183,7 @@ ADMIN_SUMMARY_TEMPLATE = """
     <h3><i class="fas fa-user-shield me-2"></i>Admin Dashboard</h3>
     <div class="d-flex gap-2">
       <div class="badge bg-info fs-6">
-        <i class="fas fa-file-alt me-1"></i>{{apps|length}} Pending Applications
+        <i class="fas fa-file-alt me-1"></i>{{pending_applications}} Pending Applications
       </div>
       <button type="button" class="btn btn-success" data-bs-toggle="modal" data-bs-target="#downloadModal">
         <i class="fas fa-download me-2"></i>Download
@@ -1729,6 +3230,35 @@ ADMIN_SUMMARY_TEMPLATE = """
     </div>
   </div>
   
+  <div class="stats-container mb-4">
+    {% for stage_name, count in stage_counts.items() %}
+    <div class="stat-card">
+      <div class="stat-number">{{ count }}</div>
+      <div class="stat-label">{{ stage_name }}</div>
+    </div>
+    {% endfor %}
+  </div>
+  
+  <h5 class="mb-3"><i class="fas fa-certificate me-2"></i>By Certificate Type</h5>
+  <div class="stats-container mb-4">
+    {% for certificate_type, count in certificate_type_counts.items() %}
+    <div class="stat-card">
+      <div class="stat-number">{{ count }}</div>
+      <div class="stat-label">{{ certificate_type }}</div>
+    </div>
+    {% endfor %}
+  </div>
+  
+  <h5 class="mb-3"><i class="fas fa-graduation-cap me-2"></i>By Degree Type</h5>
+  <div class="stats-container mb-4">
+    {% for degree_type, count in degree_type_counts.items() %}
+    <div class="stat-card">
+      <div class="stat-number">{{ count }}</div>
+      <div class="stat-label">{{ degree_type }}</div>
+    </div>
+    {% endfor %}
+  </div>
+  
   <form method="get" class="search-form mb-4">
     <div class="row g-3">
       <div class="col-md-4">
@@ -1797,6 +3327,20 @@ ADMIN_SUMMARY_TEMPLATE = """
     </div>
     {% endfor %}
   </div>
+  {% if next_url or request.args.get('cursor') %}
+  <div class="d-flex justify-content-between mt-3">
+    {% if request.args.get('cursor') %}
+    <a href="{{ first_url }}" class="btn btn-secondary btn-sm">
+      <i class="fas fa-angle-double-left me-1"></i>First Page
+    </a>
+    {% else %}<span></span>{% endif %}
+    {% if next_url %}
+    <a href="{{ next_url }}" class="btn btn-primary btn-sm">
+      Next Page<i class="fas fa-angle-right ms-1"></i>
+    </a>
+    {% endif %}
+  </div>
+  {% endif %}
 </div>
 """
 
@@ -1929,10 +3473,10 @@ ADMIN_DETAIL_TEMPLATE = """
 """
 
 # Missing templates that were referenced but not defined
-BLOCK = """
+STAGE_QUEUE = """
 <div class="fade-in">
   <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-building me-2"></i>Block Office - Pending Applications</h3>
+    <h3 class="mb-4"><i class="fas {{ stage.icon }} me-2"></i>{{ stage.name }} - Pending Applications</h3>
     
     <form method="get" class="search-form mb-4">
       <div class="row g-3">
@@ -1955,7 +3499,7 @@ BLOCK = """
           </button>
         </div>
         <div class="col-md-3">
-          <a href="/block" class="btn btn-secondary w-100">
+          <a href="/{{ stage.key }}" class="btn btn-secondary w-100">
             <i class="fas fa-refresh me-2"></i>Clear
           </a>
         </div>
@@ -1963,10 +3507,27 @@ BLOCK = """
     </form>
 
     {% if apps %}
+    <div class="d-flex flex-wrap gap-2 align-items-center mb-3">
+      <form id="bulkForm" action="/{{ stage.key }}/bulk_approve" method="post">
+        <button type="submit" class="btn btn-success btn-sm">
+          <i class="fas fa-check-double me-1"></i>Approve Selected
+        </button>
+      </form>
+      <form action="/{{ stage.key }}/bulk_approve" method="post" class="d-flex gap-2 ms-auto">
+        <input name="date" type="date" class="form-control form-control-sm" required>
+        <button type="submit" class="btn btn-outline-success btn-sm text-nowrap">
+          <i class="fas fa-calendar-check me-1"></i>Approve All Submitted On Date
+        </button>
+      </form>
+    </div>
     <div class="table-responsive">
-      <table class="table table-hover">
+      {# Rows are patched live from /<stage>/events; new arrivals only on an unfiltered first page #}
+      <table class="table table-hover" data-live-stage="{{ stage.key }}"
+             {% if not (request.args.get('search') or request.args.get('date') or request.args.get('cursor')) %}data-live-insert{% endif %}
+             {% if next_url %}data-has-next{% endif %}>
         <thead>
           <tr>
+            <th><input type="checkbox" class="form-check-input" onclick="toggleAllApps(this)"></th>
             <th>Application No</th>
             <th>Student Name</th>
             <th>Hall Ticket</th>
@@ -1977,24 +3538,70 @@ BLOCK = """
         </thead>
         <tbody>
           {% for app in apps %}
-          <tr>
+          <tr data-app-number="{{ app.app_number }}" data-key="{{ app.submission_time }}|{{ app.app_number }}">
+            <td><input type="checkbox" class="form-check-input" name="app_numbers" value="{{ app.app_number }}" form="bulkForm"></td>
             <td>{{ app.app_number }}</td>
             <td>{{ app.student_name }}</td>
             <td>{{ app.roll_number }}</td>
             <td>{{ app.certificate_type }}</td>
             <td>{{ app.submission_time }}</td>
             <td>
-              <a href="/review_block/{{ app.app_number }}" class="btn btn-primary btn-sm">
+              {% if stage.review_template %}
+              <a href="/review_{{ stage.key }}/{{ app.app_number }}" class="btn btn-primary btn-sm">
                 <i class="fas fa-eye me-1"></i>Review
               </a>
+              {% else %}
+              <form action="/{{ stage.key }}/submit/{{ app.app_number }}" method="post" style="display:inline;" data-live-approve>
+                <button type="submit" class="btn btn-success btn-sm">
+                  <i class="fas fa-check me-1"></i>Approve
+                </button>
+              </form>
+              {% endif %}
             </td>
           </tr>
           {% endfor %}
         </tbody>
       </table>
+      <template id="liveRowTemplate">
+        <tr>
+          <td><input type="checkbox" class="form-check-input" name="app_numbers" form="bulkForm" data-live-value></td>
+          <td data-live-field="app_number"></td>
+          <td data-live-field="student_name"></td>
+          <td data-live-field="roll_number"></td>
+          <td data-live-field="certificate_type"></td>
+          <td data-live-field="submission_time"></td>
+          <td>
+            {% if stage.review_template %}
+            <a href="/review_{{ stage.key }}/__APP_NUMBER__" class="btn btn-primary btn-sm">
+              <i class="fas fa-eye me-1"></i>Review
+            </a>
+            {% else %}
+            <form action="/{{ stage.key }}/submit/__APP_NUMBER__" method="post" style="display:inline;" data-live-approve>
+              <button type="submit" class="btn btn-success btn-sm">
+                <i class="fas fa-check me-1"></i>Approve
+              </button>
+            </form>
+            {% endif %}
+          </td>
+        </tr>
+      </template>
+    </div>
+    {% if next_url or request.args.get('cursor') %}
+    <div class="d-flex justify-content-between mt-3">
+      {% if request.args.get('cursor') %}
+      <a href="{{ first_url }}" class="btn btn-secondary btn-sm">
+        <i class="fas fa-angle-double-left me-1"></i>First Page
+      </a>
+      {% else %}<span></span>{% endif %}
+      {% if next_url %}
+      <a href="{{ next_url }}" class="btn btn-primary btn-sm">
+        Next Page<i class="fas fa-angle-right ms-1"></i>
+      </a>
+      {% endif %}
     </div>
+    {% endif %}
     {% else %}
-    <div class="text-center py-5">
+    <div class="text-center py-5" data-live-empty="{{ stage.key }}">
       <i class="fas fa-check-circle fa-3x mb-3 text-success"></i>
       <h5 class="text-muted">No pending applications</h5>
       <p class="text-muted">All applications have been processed</p>
@@ -2004,10 +3611,31 @@ BLOCK = """
 </div>
 """
 
-COMPUTER_SESSION = """
+REVIEW_STAGE = """
+<div class="card p-4 fade-in">
+    <h3 class="card-title mb-4">Review Application for {{ app_data.get('student_name', 'N/A') }}</h3>
+    <p><strong>Application Number:</strong> {{ app_data.get('app_number', 'N/A') }}</p>
+    <p><strong>Hall Ticket No:</strong> {{ app_data.get('roll_number', 'N/A') }}</p>
+    <p><strong>Certificate Type:</strong> {{ app_data.get('certificate_type', 'N/A') }}</p>
+    <p><strong>Degree:</strong> {{ app_data.get('degree_type', 'N/A') }} - {{ app_data.get('sub_category', 'N/A') }}</p>
+    <p><strong>Fee Option:</strong> {{ app_data.get('fee_option_label', 'N/A') }}</p>
+    <p><strong>Submitted Documents:</strong></p>
+    <ul>
+        {% for doc in app_data.get('certificate_documents', []) %}<li>{{ doc }}</li>{% endfor %}
+    </ul>
+    <div class="mt-4">
+        <form action="/{{ stage.key }}/approve/{{ app_data.app_number }}" method="post" style="display:inline;">
+            <button type="submit" class="btn btn-success me-2">Approve</button>
+        </form>
+        <a href="/{{ stage.key }}" class="btn btn-secondary">Back to Dashboard</a>
+    </div>
+</div>
+"""
+
+VERIFIED_CERTIFICATES = """
 <div class="fade-in">
   <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-laptop me-2"></i>Computer Session - Pending Applications</h3>
+    <h3 class="mb-4"><i class="fas fa-certificate me-2"></i>Verified Certificates</h3>
     
     <form method="get" class="search-form mb-4">
       <div class="row g-3">
@@ -2030,14 +3658,14 @@ COMPUTER_SESSION = """
           </button>
         </div>
         <div class="col-md-3">
-          <a href="/computer_session" class="btn btn-secondary w-100">
+          <a href="/verified_certificates" class="btn btn-secondary w-100">
             <i class="fas fa-refresh me-2"></i>Clear
           </a>
         </div>
       </div>
     </form>
 
-    {% if apps %}
+    {% if verified %}
     <div class="table-responsive">
       <table class="table table-hover">
         <thead>
@@ -2046,448 +3674,77 @@ COMPUTER_SESSION = """
             <th>Student Name</th>
             <th>Hall Ticket</th>
             <th>Certificate Type</th>
-            <th>Submission Time</th>
+            <th>Verification Date</th>
             <th>Action</th>
           </tr>
         </thead>
         <tbody>
-          {% for app in apps %}
+          {% for cert in verified %}
           <tr>
-            <td>{{ app.app_number }}</td>
-            <td>{{ app.student_name }}</td>
-            <td>{{ app.roll_number }}</td>
-            <td>{{ app.certificate_type }}</td>
-            <td>{{ app.submission_time }}</td>
+            <td>{{ cert.app_number }}</td>
+            <td>{{ cert.student_name }}</td>
+            <td>{{ cert.roll_number }}</td>
+            <td>{{ cert.certificate_type }}</td>
+            <td>{{ cert.verified_time }}</td>
             <td>
-              <form action="/computer_session/submit/{{ app.app_number }}" method="post" style="display:inline;">
-                <button type="submit" class="btn btn-success btn-sm">
-                  <i class="fas fa-check me-1"></i>Approve
-                </button>
-              </form>
+              <a href="/view_certificate/{{ cert.app_number }}" class="btn btn-primary btn-sm">
+                <i class="fas fa-eye me-1"></i>View Certificate
+              </a>
             </td>
           </tr>
           {% endfor %}
         </tbody>
       </table>
     </div>
+    {% if next_url or request.args.get('cursor') %}
+    <div class="d-flex justify-content-between mt-3">
+      {% if request.args.get('cursor') %}
+      <a href="{{ first_url }}" class="btn btn-secondary btn-sm">
+        <i class="fas fa-angle-double-left me-1"></i>First Page
+      </a>
+      {% else %}<span></span>{% endif %}
+      {% if next_url %}
+      <a href="{{ next_url }}" class="btn btn-primary btn-sm">
+        Next Page<i class="fas fa-angle-right ms-1"></i>
+      </a>
+      {% endif %}
+    </div>
+    {% endif %}
     {% else %}
     <div class="text-center py-5">
-      <i class="fas fa-check-circle fa-3x mb-3 text-success"></i>
-      <h5 class="text-muted">No pending applications</h5>
-      <p class="text-muted">All applications have been processed</p>
+      <i class="fas fa-certificate fa-3x mb-3 text-muted"></i>
+      <h5 class="text-muted">No verified certificates</h5>
+      <p class="text-muted">No certificates have been verified yet</p>
     </div>
     {% endif %}
   </div>
 </div>
 """
 
-REBLOCK_QUEUE_TEMPLATE = """
+VIEW_CERTIFICATE = """
 <div class="fade-in">
   <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-redo me-2"></i>Re-Block Queue - Pending Applications</h3>
+    <div class="text-center mb-4">
+      <i class="fas fa-certificate fa-3x mb-3" style="background: var(--gradient-primary); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text;"></i>
+      <h3>Certificate Details</h3>
+      <p class="text-muted">Certificate for {{cert.student_name}}</p>
+    </div>
     
-    <form method="get" class="search-form mb-4">
-      <div class="row g-3">
-        <div class="col-md-4">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-search"></i></span>
-            <input name="search" class="form-control" placeholder="Search by name or hall ticket" 
-                   value="{{request.args.get('search', '')}}">
-          </div>
-        </div>
-        <div class="col-md-3">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-calendar"></i></span>
-            <input name="date" type="date" class="form-control" value="{{request.args.get('date', '')}}">
-          </div>
-        </div>
-        <div class="col-md-2">
-          <button class="btn btn-primary w-100">
-            <i class="fas fa-search me-2"></i>Search
-          </button>
+    <div class="row">
+      <div class="col-md-6">
+        <div class="certificate-info mb-4">
+          <h5 class="mb-3"><i class="fas fa-user-graduate me-2"></i>Student Information</h5>
+          <p><strong>Name:</strong> {{cert.student_name}}</p>
+          <p><strong>Hall Ticket No:</strong> {{cert.roll_number}}</p>
+          <p><strong>Application No:</strong> {{cert.app_number}}</p>
         </div>
-        <div class="col-md-3">
-          <a href="/reblock" class="btn btn-secondary w-100">
-            <i class="fas fa-refresh me-2"></i>Clear
-          </a>
-        </div>
-      </div>
-    </form>
-
-    {% if apps %}
-    <div class="table-responsive">
-      <table class="table table-hover">
-        <thead>
-          <tr>
-            <th>Application No</th>
-            <th>Student Name</th>
-            <th>Hall Ticket</th>
-            <th>Certificate Type</th>
-            <th>Submission Time</th>
-            <th>Action</th>
-          </tr>
-        </thead>
-        <tbody>
-          {% for app in apps %}
-          <tr>
-            <td>{{ app.app_number }}</td>
-            <td>{{ app.student_name }}</td>
-            <td>{{ app.roll_number }}</td>
-            <td>{{ app.certificate_type }}</td>
-            <td>{{ app.submission_time }}</td>
-            <td>
-              <form action="/reblock/submit/{{ app.app_number }}" method="post" style="display:inline;">
-                <button type="submit" class="btn btn-success btn-sm">
-                  <i class="fas fa-check me-1"></i>Approve
-                </button>
-              </form>
-            </td>
-          </tr>
-          {% endfor %}
-        </tbody>
-      </table>
-    </div>
-    {% else %}
-    <div class="text-center py-5">
-      <i class="fas fa-check-circle fa-3x mb-3 text-success"></i>
-      <h5 class="text-muted">No pending applications</h5>
-      <p class="text-muted">All applications have been processed</p>
-    </div>
-    {% endif %}
-  </div>
-</div>
-"""
-
-AR_SESSION = """
-<div class="fade-in">
-  <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-cube me-2"></i>AR Session - Pending Applications</h3>
-    
-    <form method="get" class="search-form mb-4">
-      <div class="row g-3">
-        <div class="col-md-4">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-search"></i></span>
-            <input name="search" class="form-control" placeholder="Search by name or hall ticket" 
-                   value="{{request.args.get('search', '')}}">
-          </div>
-        </div>
-        <div class="col-md-3">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-calendar"></i></span>
-            <input name="date" type="date" class="form-control" value="{{request.args.get('date', '')}}">
-          </div>
-        </div>
-        <div class="col-md-2">
-          <button class="btn btn-primary w-100">
-            <i class="fas fa-search me-2"></i>Search
-          </button>
-        </div>
-        <div class="col-md-3">
-          <a href="/ar_session" class="btn btn-secondary w-100">
-            <i class="fas fa-refresh me-2"></i>Clear
-          </a>
-        </div>
-      </div>
-    </form>
-
-    {% if apps %}
-    <div class="table-responsive">
-      <table class="table table-hover">
-        <thead>
-          <tr>
-            <th>Application No</th>
-            <th>Student Name</th>
-            <th>Hall Ticket</th>
-            <th>Certificate Type</th>
-            <th>Submission Time</th>
-            <th>Action</th>
-          </tr>
-        </thead>
-        <tbody>
-          {% for app in apps %}
-          <tr>
-            <td>{{ app.app_number }}</td>
-            <td>{{ app.student_name }}</td>
-            <td>{{ app.roll_number }}</td>
-            <td>{{ app.certificate_type }}</td>
-            <td>{{ app.submission_time }}</td>
-            <td>
-              <form action="/ar_session/submit/{{ app.app_number }}" method="post" style="display:inline;">
-                <button type="submit" class="btn btn-success btn-sm">
-                  <i class="fas fa-check me-1"></i>Approve
-                </button>
-              </form>
-            </td>
-          </tr>
-          {% endfor %}
-        </tbody>
-      </table>
-    </div>
-    {% else %}
-    <div class="text-center py-5">
-      <i class="fas fa-check-circle fa-3x mb-3 text-success"></i>
-      <h5 class="text-muted">No pending applications</h5>
-      <p class="text-muted">All applications have been processed</p>
-    </div>
-    {% endif %}
-  </div>
-</div>
-"""
-
-VR_SESSION = """
-<div class="fade-in">
-  <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-vr-cardboard me-2"></i>VR Session - Pending Applications</h3>
-    
-    <form method="get" class="search-form mb-4">
-      <div class="row g-3">
-        <div class="col-md-4">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-search"></i></span>
-            <input name="search" class="form-control" placeholder="Search by name or hall ticket" 
-                   value="{{request.args.get('search', '')}}">
-          </div>
-        </div>
-        <div class="col-md-3">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-calendar"></i></span>
-            <input name="date" type="date" class="form-control" value="{{request.args.get('date', '')}}">
-          </div>
-        </div>
-        <div class="col-md-2">
-          <button class="btn btn-primary w-100">
-            <i class="fas fa-search me-2"></i>Search
-          </button>
-        </div>
-        <div class="col-md-3">
-          <a href="/vr_session" class="btn btn-secondary w-100">
-            <i class="fas fa-refresh me-2"></i>Clear
-          </a>
-        </div>
-      </div>
-    </form>
-
-    {% if apps %}
-    <div class="table-responsive">
-      <table class="table table-hover">
-        <thead>
-          <tr>
-            <th>Application No</th>
-            <th>Student Name</th>
-            <th>Hall Ticket</th>
-            <th>Certificate Type</th>
-            <th>Submission Time</th>
-            <th>Action</th>
-          </tr>
-        </thead>
-        <tbody>
-          {% for app in apps %}
-          <tr>
-            <td>{{ app.app_number }}</td>
-            <td>{{ app.student_name }}</td>
-            <td>{{ app.roll_number }}</td>
-            <td>{{ app.certificate_type }}</td>
-            <td>{{ app.submission_time }}</td>
-            <td>
-              <form action="/vr_session/submit/{{ app.app_number }}" method="post" style="display:inline;">
-                <button type="submit" class="btn btn-success btn-sm">
-                  <i class="fas fa-check me-1"></i>Approve
-                </button>
-              </form>
-            </td>
-          </tr>
-          {% endfor %}
-        </tbody>
-      </table>
-    </div>
-    {% else %}
-    <div class="text-center py-5">
-      <i class="fas fa-check-circle fa-3x mb-3 text-success"></i>
-      <h5 class="text-muted">No pending applications</h5>
-      <p class="text-muted">All applications have been processed</p>
-    </div>
-    {% endif %}
-  </div>
-</div>
-"""
-
-POST_SESSION = """
-<div class="fade-in">
-  <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-mail-bulk me-2"></i>Post Session - Pending Applications</h3>
-    
-    <form method="get" class="search-form mb-4">
-      <div class="row g-3">
-        <div class="col-md-4">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-search"></i></span>
-            <input name="search" class="form-control" placeholder="Search by name or hall ticket" 
-                   value="{{request.args.get('search', '')}}">
-          </div>
-        </div>
-        <div class="col-md-3">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-calendar"></i></span>
-            <input name="date" type="date" class="form-control" value="{{request.args.get('date', '')}}">
-          </div>
-        </div>
-        <div class="col-md-2">
-          <button class="btn btn-primary w-100">
-            <i class="fas fa-search me-2"></i>Search
-          </button>
-        </div>
-        <div class="col-md-3">
-          <a href="/post_session" class="btn btn-secondary w-100">
-            <i class="fas fa-refresh me-2"></i>Clear
-          </a>
-        </div>
-      </div>
-    </form>
-
-    {% if apps %}
-    <div class="table-responsive">
-      <table class="table table-hover">
-        <thead>
-          <tr>
-            <th>Application No</th>
-            <th>Student Name</th>
-            <th>Hall Ticket</th>
-            <th>Certificate Type</th>
-            <th>Submission Time</th>
-            <th>Action</th>
-          </tr>
-        </thead>
-        <tbody>
-          {% for app in apps %}
-          <tr>
-            <td>{{ app.app_number }}</td>
-            <td>{{ app.student_name }}</td>
-            <td>{{ app.roll_number }}</td>
-            <td>{{ app.certificate_type }}</td>
-            <td>{{ app.submission_time }}</td>
-            <td>
-              <form action="/post_session/submit/{{ app.app_number }}" method="post" style="display:inline;">
-                <button type="submit" class="btn btn-success btn-sm">
-                  <i class="fas fa-check me-1"></i>Approve
-                </button>
-              </form>
-            </td>
-          </tr>
-          {% endfor %}
-        </tbody>
-      </table>
-    </div>
-    {% else %}
-    <div class="text-center py-5">
-      <i class="fas fa-check-circle fa-3x mb-3 text-success"></i>
-      <h5 class="text-muted">No pending applications</h5>
-      <p class="text-muted">All applications have been processed</p>
-    </div>
-    {% endif %}
-  </div>
-</div>
-"""
-
-VERIFIED_CERTIFICATES = """
-<div class="fade-in">
-  <div class="card p-4">
-    <h3 class="mb-4"><i class="fas fa-certificate me-2"></i>Verified Certificates</h3>
-    
-    <form method="get" class="search-form mb-4">
-      <div class="row g-3">
-        <div class="col-md-4">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-search"></i></span>
-            <input name="search" class="form-control" placeholder="Search by name or hall ticket" 
-                   value="{{request.args.get('search', '')}}">
-          </div>
-        </div>
-        <div class="col-md-3">
-          <div class="input-group">
-            <span class="input-group-text"><i class="fas fa-calendar"></i></span>
-            <input name="date" type="date" class="form-control" value="{{request.args.get('date', '')}}">
-          </div>
-        </div>
-        <div class="col-md-2">
-          <button class="btn btn-primary w-100">
-            <i class="fas fa-search me-2"></i>Search
-          </button>
-        </div>
-        <div class="col-md-3">
-          <a href="/verified_certificates" class="btn btn-secondary w-100">
-            <i class="fas fa-refresh me-2"></i>Clear
-          </a>
-        </div>
-      </div>
-    </form>
-
-    {% if verified %}
-    <div class="table-responsive">
-      <table class="table table-hover">
-        <thead>
-          <tr>
-            <th>Application No</th>
-            <th>Student Name</th>
-            <th>Hall Ticket</th>
-            <th>Certificate Type</th>
-            <th>Verification Date</th>
-            <th>Action</th>
-          </tr>
-        </thead>
-        <tbody>
-          {% for cert in verified %}
-          <tr>
-            <td>{{ cert.app_number }}</td>
-            <td>{{ cert.student_name }}</td>
-            <td>{{ cert.roll_number }}</td>
-            <td>{{ cert.certificate_type }}</td>
-            <td>{{ cert.verified_time }}</td>
-            <td>
-              <a href="/view_certificate/{{ cert.app_number }}" class="btn btn-primary btn-sm">
-                <i class="fas fa-eye me-1"></i>View Certificate
-              </a>
-            </td>
-          </tr>
-          {% endfor %}
-        </tbody>
-      </table>
-    </div>
-    {% else %}
-    <div class="text-center py-5">
-      <i class="fas fa-certificate fa-3x mb-3 text-muted"></i>
-      <h5 class="text-muted">No verified certificates</h5>
-      <p class="text-muted">No certificates have been verified yet</p>
-    </div>
-    {% endif %}
-  </div>
-</div>
-"""
-
-VIEW_CERTIFICATE = """
-<div class="fade-in">
-  <div class="card p-4">
-    <div class="text-center mb-4">
-      <i class="fas fa-certificate fa-3x mb-3" style="background: var(--gradient-primary); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text;"></i>
-      <h3>Certificate Details</h3>
-      <p class="text-muted">Certificate for {{cert.student_name}}</p>
-    </div>
-    
-    <div class="row">
-      <div class="col-md-6">
-        <div class="certificate-info mb-4">
-          <h5 class="mb-3"><i class="fas fa-user-graduate me-2"></i>Student Information</h5>
-          <p><strong>Name:</strong> {{cert.student_name}}</p>
-          <p><strong>Hall Ticket No:</strong> {{cert.roll_number}}</p>
-          <p><strong>Application No:</strong> {{cert.app_number}}</p>
-        </div>
-      </div>
-      <div class="col-md-6">
-        <div class="certificate-details mb-4">
-          <h5 class="mb-3"><i class="fas fa-certificate me-2"></i>Certificate Details</h5>
-          <p><strong>Certificate Type:</strong> {{cert.certificate_type}}</p>
-          <p><strong>Degree:</strong> {{cert.degree_type}} - {{cert.sub_category}}</p>
-          <p><strong>Verification Date:</strong> {{cert.verified_time}}</p>
+      </div>
+      <div class="col-md-6">
+        <div class="certificate-details mb-4">
+          <h5 class="mb-3"><i class="fas fa-certificate me-2"></i>Certificate Details</h5>
+          <p><strong>Certificate Type:</strong> {{cert.certificate_type}}</p>
+          <p><strong>Degree:</strong> {{cert.degree_type}} - {{cert.sub_category}}</p>
+          <p><strong>Verification Date:</strong> {{cert.verified_time}}</p>
         </div>
       </div>
     </div>
@@ -2515,42 +3772,75 @@ VIEW_CERTIFICATE = """
 </div>
 """
 
+# Full pages (BASE with each body in place of {{content}}) served through a
+# DictLoader, so Jinja compiles each one once and reuses the cached Template
+TEMPLATES = {
+    'index.html': INDEX,
+    'student_portal.html': STUDENT_PORTAL,
+    'admin_summary.html': ADMIN_SUMMARY_TEMPLATE,
+    'admin_search.html': ADMIN_SEARCH_TEMPLATE,
+    'admin_detail.html': ADMIN_DETAIL_TEMPLATE,
+    'stage_queue.html': STAGE_QUEUE,
+    'review_stage.html': REVIEW_STAGE,
+    'verified_certificates.html': VERIFIED_CERTIFICATES,
+    'view_certificate.html': VIEW_CERTIFICATE,
+}
+app.jinja_loader = DictLoader({name: BASE.replace('{{content}}', body) for name, body in TEMPLATES.items()})
+
+@app.context_processor
+def live_queues_enabled():
+    return {'live_queues': LIVE_QUEUES}
+
+@app.context_processor
+def parquet_export_enabled():
+    # Parquet exports need pyarrow; without it the format is not offered
+    return {'parquet_export': pq is not None}
+
 # Routes
 @app.route('/')
 def application():
-    return render_template_string(BASE.replace('{{content}}', INDEX))
+    return render_template('index.html')
 
 @app.route('/student_portal', methods=['GET','POST'])
 def student_portal():
     app_data = None
+    if request.method == 'POST':
+        app_data = store.status(request.form['hall_ticket'])[0]
+    return render_student_portal(app_data)
+
+@app.route('/status/<hall_ticket>')
+def student_status(hall_ticket):
+    """Student portal result for a hall ticket as a GET that repeat polls can revalidate (ETag / Last-Modified)"""
+    app_data, etag, last_modified = store.status(hall_ticket)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(render_student_portal(app_data), 200 if app_data else 404)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+def render_student_portal(app_data):
     timeline = []
     current_stage = None
     progress_percentage = 0
-    if request.method == 'POST':
-        hall_ticket = request.form['hall_ticket']
-        apps = load_json(APPLICATIONS_FILE)
-        verified_apps = load_json(VERIFIED_CERTIFICATES_FILE)
+    if app_data:
+        app_data = dict(app_data)
+        current_stage = get_current_stage(app_data)
+        timeline = build_timeline(app_data)
+        progress_percentage = get_progress_percentage(timeline)
         
-        # Search in both applications and verified certificates
-        app_data = next((x for x in apps if x.get('roll_number') == hall_ticket), None)
-        if not app_data:
-            app_data = next((x for x in verified_apps if x.get('roll_number') == hall_ticket), None)
-            
-        if app_data:
-            current_stage = get_current_stage(app_data)
-            timeline = build_timeline(app_data)
-            progress_percentage = get_progress_percentage(timeline)
-            
-            # Add fee option label for display
-            fee_labels = {
-                'within_state_50': 'Within State - Rs 50',
-                'other_state_60': 'Other State - Rs 60',
-                'within_state_80': 'Within State - Rs 80',
-                'other_state_100': 'Other State - Rs 100'
-            }
-            app_data['fee_option_label'] = fee_labels.get(app_data.get('fee_option'), app_data.get('fee_option', 'N/A'))
+        # Add fee option label for display
+        fee_labels = {
+            'within_state_50': 'Within State - Rs 50',
+            'other_state_60': 'Other State - Rs 60',
+            'within_state_80': 'Within State - Rs 80',
+            'other_state_100': 'Other State - Rs 100'
+        }
+        app_data['fee_option_label'] = fee_labels.get(app_data.get('fee_option'), app_data.get('fee_option', 'N/A'))
             
-    return render_template_string(BASE.replace('{{content}}', STUDENT_PORTAL), 
+    return render_template('student_portal.html', 
                                 app_data=app_data, timeline=timeline, 
                                 current_stage=current_stage, progress_percentage=progress_percentage)
 
@@ -2567,13 +3857,15 @@ def check_duplicate():
 
 @app.route('/submit_application', methods=['POST'])
 def submit_application():
-    form = request.form
-    certificate_documents = request.form.getlist('certificate_documents')
-    fee_option = request.form.get('fee_option')
-    
-    # Check for duplicate application
-    if check_duplicate_application(form['roll_number'], form['certificate_type']):
+    a = new_application(request.form, request.form.getlist('certificate_documents'))
+    # The duplicate check runs again under the store's write lock
+    if not store.add(a):
         return redirect(url_for('application'))
+    return redirect(url_for('student_portal'))
+
+def new_application(form, certificate_documents):
+    """Record for a new application from the submitted fields (a form or JSON object)"""
+    fee_option = form.get('fee_option')
     
     # Map fee option values to readable labels
     fee_labels = {
@@ -2609,254 +3901,151 @@ def submit_application():
         'post_time': None,
         'verified_time': None
     }
-    apps = load_json(APPLICATIONS_FILE)
-    apps.append(a)
-    save_json(APPLICATIONS_FILE, apps)
-    return redirect(url_for('student_portal'))
+    return a
+
+def stage_queue_view(key):
+    def view():
+        search = request.args.get('search', '')
+        date_filter = request.args.get('date', '')
+        filtered_apps, next_cursor = paginate(filter_apps(key, search, date_filter), *page_args())
+        return render_template(STAGES[key]['template'], stage=dict(STAGES[key], key=key), apps=filtered_apps,
+                               **page_links(next_cursor))
+    return view
+
+def stage_review_view(key):
+    def view(app_no):
+        app_data = store.get(app_no)
+        if not app_data:
+            return redirect(url_for(STAGES[key]['endpoint']))
+        return render_template(STAGES[key]['review_template'], stage=dict(STAGES[key], key=key), app_data=app_data)
+    return view
+
+def stage_approve_view(key):
+    def view(app_no):
+        moved = store.transition(app_no, key)
+        # The live dashboard approves in the background and only needs to know it worked
+        if request.headers.get('X-Requested-With') == 'fetch':
+            return ('', 204) if moved else ('', 409)
+        return redirect(url_for(STAGES[key]['endpoint']))
+    return view
+
+def register_stage_routes():
+    """Dashboard and approval routes for every stage in the workflow.
+
+    /<key> lists the stage's queue. Stages with a review page approve from
+    /review_<key>/<app_no> via POST /<key>/approve/<app_no>; the others
+    approve straight from the queue via POST /<key>/submit/<app_no>.
+    """
+    for key in WORKFLOW.order:
+        stage = STAGES[key]
+        app.add_url_rule(f'/{key}', stage['endpoint'], stage_queue_view(key))
+        if stage.get('review_template'):
+            app.add_url_rule(f'/review_{key}/<app_no>', f'review_{key}', stage_review_view(key))
+            app.add_url_rule(f'/{key}/approve/<app_no>', f'approve_{key}', stage_approve_view(key), methods=['POST'])
+        else:
+            app.add_url_rule(f'/{key}/submit/<app_no>', f'submit_{key}', stage_approve_view(key), methods=['POST'])
 
-@app.route('/block')
-def block_office():
-    apps = load_json(APPLICATIONS_FILE)
-    search = request.args.get('search', '')
-    date_filter = request.args.get('date', '')
-    pending_apps = [a for a in apps if not a.get('verification_status')]
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
-    return render_template_string(BASE.replace('{{content}}', BLOCK), apps=filtered_apps)
-
-@app.route('/review_block/<app_no>')
-def review_block(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    app_data = next((x for x in apps if x.get('app_number') == app_no), None)
-    if not app_data:
-        return redirect(url_for('block_office'))
-    
-    content = f"""
-    <div class="card p-4 fade-in">
-        <h3 class="card-title mb-4">Review Application for {app_data.get('student_name', 'N/A')}</h3>
-        <p><strong>Application Number:</strong> {app_data.get('app_number', 'N/A')}</p>
-        <p><strong>Hall Ticket No:</strong> {app_data.get('roll_number', 'N/A')}</p>
-        <p><strong>Certificate Type:</strong> {app_data.get('certificate_type', 'N/A')}</p>
-        <p><strong>Degree:</strong> {app_data.get('degree_type', 'N/A')} - {app_data.get('sub_category', 'N/A')}</p>
-        <p><strong>Fee Option:</strong> {app_data.get('fee_option_label', 'N/A')}</p>
-        <p><strong>Submitted Documents:</strong></p>
-        <ul>
-            {"".join(f"<li>{doc}</li>" for doc in app_data.get('certificate_documents', []))}
-        </ul>
-        <div class="mt-4">
-            <form action="/block/approve/{app_no}" method="post" style="display:inline;">
-                <button type="submit" class="btn btn-success me-2">Approve</button>
-            </form>
-            <a href="/block" class="btn btn-secondary">Back to Dashboard</a>
-        </div>
-    </div>
+register_stage_routes()
+
+@app.route('/<stage>/events')
+def stage_events(stage):
+    """Server-sent events for a stage queue: 'insert' with a row's fields when an application
+    arrives, 'remove' with its app_number when it leaves. Each stream closes after
+    SSE_STREAM_SECONDS and the browser reconnects, so no worker is held indefinitely.
     """
-    return render_template_string(BASE.replace('{{content}}', content))
-
-@app.route('/block/approve/<app_no>', methods=['POST'])
-def approve_block(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    for a in apps:
-        if a.get('app_number') == app_no:
-            a['verification_status'] = 'approve'
-            a['verification_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            a['status'] = 'Approved by Block Office'
-            save_json(APPLICATIONS_FILE, apps)
-            return redirect(url_for('block_office'))
-    return redirect(url_for('block_office'))
-
-@app.route('/computer_session')
-def computer_session():
-    apps = load_json(APPLICATIONS_FILE)
-    search = request.args.get('search', '')
-    date_filter = request.args.get('date', '')
-    pending_apps = [a for a in apps if a.get('verification_status') == 'approve' and not a.get('computer_session_status')]
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
-    return render_template_string(BASE.replace('{{content}}', COMPUTER_SESSION), apps=filtered_apps)
-
-@app.route('/computer_session/submit/<app_no>', methods=['POST'])
-def submit_computer_session(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    for a in apps:
-        if a.get('app_number') == app_no:
-            a['computer_session_status'] = 'approved'
-            a['computer_session_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            a['status'] = 'Approved by Computer Session'
-            save_json(APPLICATIONS_FILE, apps)
-            return redirect(url_for('computer_session'))
-    return redirect(url_for('computer_session'))
-
-@app.route('/reblock')
-def reblock_queue():
-    apps = load_json(APPLICATIONS_FILE)
-    search = request.args.get('search', '')
-    date_filter = request.args.get('date', '')
-    pending_apps = [a for a in apps if a.get('computer_session_status') == 'approved' and not a.get('reblock_status')]
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
-    return render_template_string(BASE.replace('{{content}}', REBLOCK_QUEUE_TEMPLATE), apps=filtered_apps)
-
-@app.route('/reblock/submit/<app_no>', methods=['POST'])
-def submit_reblock(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    for a in apps:
-        if a.get('app_number') == app_no:
-            a['reblock_status'] = 'approved'
-            a['reblock_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            a['status'] = 'Approved by Re-Block'
-            save_json(APPLICATIONS_FILE, apps)
-            return redirect(url_for('reblock_queue'))
-    return redirect(url_for('reblock_queue'))
-
-@app.route('/ar_session')
-def ar_session():
-    apps = load_json(APPLICATIONS_FILE)
-    search = request.args.get('search', '')
-    date_filter = request.args.get('date', '')
-    pending_apps = [a for a in apps if a.get('reblock_status') == 'approved' and not a.get('ar_status')]
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
-    return render_template_string(BASE.replace('{{content}}', AR_SESSION), apps=filtered_apps)
-
-@app.route('/ar_session/submit/<app_no>', methods=['POST'])
-def submit_ar_session(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    for a in apps:
-        if a.get('app_number') == app_no:
-            a['ar_status'] = 'approved'
-            a['ar_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            a['status'] = 'Approved by AR Session'
-            save_json(APPLICATIONS_FILE, apps)
-            return redirect(url_for('ar_session'))
-    return redirect(url_for('ar_session'))
-
-@app.route('/vr_session')
-def vr_session():
-    apps = load_json(APPLICATIONS_FILE)
-    search = request.args.get('search', '')
-    date_filter = request.args.get('date', '')
-    pending_apps = [a for a in apps if a.get('ar_status') == 'approved' and not a.get('vr_status')]
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
-    return render_template_string(BASE.replace('{{content}}', VR_SESSION), apps=filtered_apps)
-
-@app.route('/vr_session/submit/<app_no>', methods=['POST'])
-def submit_vr_session(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    for a in apps:
-        if a.get('app_number') == app_no:
-            a['vr_status'] = 'approved'
-            a['vr_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            a['status'] = 'Approved by VR Session'
-            save_json(APPLICATIONS_FILE, apps)
-            return redirect(url_for('vr_session'))
-    return redirect(url_for('vr_session'))
-
-@app.route('/post_session')
-def post_session():
-    apps = load_json(APPLICATIONS_FILE)
-    search = request.args.get('search', '')
-    date_filter = request.args.get('date', '')
-    pending_apps = [a for a in apps if a.get('vr_status') == 'approved' and not a.get('post_status')]
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
-    return render_template_string(BASE.replace('{{content}}', POST_SESSION), apps=filtered_apps)
-
-@app.route('/post_session/submit/<app_no>', methods=['POST'])
-def submit_post_session(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    verified = load_json(VERIFIED_CERTIFICATES_FILE)
-    for a in apps:
-        if a.get('app_number') == app_no:
-            a['post_status'] = 'approved'
-            a['post_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            a['status'] = 'Approved by Post Session'
-            a['verified_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            save_json(APPLICATIONS_FILE, apps)
-            verified.append(a)
-            save_json(VERIFIED_CERTIFICATES_FILE, verified)
-            return redirect(url_for('post_session'))
-    return redirect(url_for('post_session'))
+    if not LIVE_QUEUES or stage not in STAGES:
+        abort(404)
+
+    def stream():
+        subscription = store.subscribe(stage)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            deadline = time.monotonic() + SSE_STREAM_SECONDS
+            last_sent = time.monotonic()
+            while time.monotonic() < deadline:
+                # Refreshing the view publishes changes written by other workers
+                store.data_version()
+                events = subscription.get(SSE_POLL_SECONDS)
+                for event in events:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+                if events:
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+        finally:
+            store.unsubscribe(subscription)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/<stage>/bulk_approve', methods=['POST'])
+def bulk_approve(stage):
+    """Move the selected applications, or all submitted on a date, to the next stage in one write"""
+    if stage not in STAGES:
+        abort(404)
+    app_numbers = request.form.getlist('app_numbers')
+    date_filter = request.form.get('date')
+    if date_filter:
+        app_numbers += [a['app_number'] for a in store.submitted_on(date_filter, stage)]
+    store.transition_many(app_numbers, stage)
+    return redirect(url_for(STAGES[stage]['endpoint']))
 
 @app.route('/verified_certificates')
 def verified_certificates():
-    vc = load_json(VERIFIED_CERTIFICATES_FILE)
-    # Remove duplicates
-    seen = set()
-    unique_vc = []
-    for v in vc:
-        if v.get('app_number') and v.get('app_number') not in seen:
-            unique_vc.append(v)
-            seen.add(v['app_number'])
-    
+    # The store indexes verified certificates by app_number, so each appears once
     search = request.args.get('search', '')
     date_filter = request.args.get('date', '')
-    filtered_vc = filter_apps(unique_vc, search, date_filter)
+    filtered_vc, next_cursor = paginate(filter_apps('verified', search, date_filter), *page_args())
     
-    return render_template_string(BASE.replace('{{content}}', VERIFIED_CERTIFICATES), verified=filtered_vc)
+    return render_template('verified_certificates.html', verified=filtered_vc, **page_links(next_cursor))
 
 @app.route('/view_certificate/<app_no>')
 def view_certificate(app_no):
-    vc = load_json(VERIFIED_CERTIFICATES_FILE)
-    cert = next((x for x in vc if x.get('app_number')==app_no), None)
+    cert = store.get_verified(app_no)
     if not cert:
         return redirect(url_for('verified_certificates'))
-    return render_template_string(BASE.replace('{{content}}', VIEW_CERTIFICATE), cert=cert)
+    return render_template('view_certificate.html', cert=cert)
 
 @app.route('/admin')
 def admin_dashboard():
-    apps = load_json(APPLICATIONS_FILE)
-    all_apps = apps
-    verified_apps = load_json(VERIFIED_CERTIFICATES_FILE)
-    
-    # Get only pending applications
-    pending_apps = get_pending_apps(apps)
-    
     search = request.args.get('search', '')
     date_filter = request.args.get('date', '')
-    filtered_apps = filter_apps(pending_apps, search, date_filter)
+    filtered_apps, next_cursor = paginate(filter_apps('pending', search, date_filter), *page_args())
     
-    # Calculate statistics
-    total_applications = len(all_apps)
-    pending_applications_count = len(pending_apps)
-    verified_applications_count = len(verified_apps)
+    # Statistics come from the store's running counters
+    stats = store.stats()
     
-    return render_template_string(BASE.replace('{{content}}', ADMIN_SUMMARY_TEMPLATE), 
+    return render_template('admin_summary.html', 
                                   apps=filtered_apps, 
                                   get_current_stage=get_current_stage,
-                                  total_applications=total_applications,
-                                  pending_applications=pending_applications_count,
-                                  verified_applications=verified_applications_count)
+                                  total_applications=stats['total'],
+                                  pending_applications=stats['pending'],
+                                  verified_applications=stats['verified'],
+                                  stage_counts={STAGES[key]['name']: count for key, count in stats['stages'].items()},
+                                  certificate_type_counts=dict(Counter(stats['certificate_types']).most_common()),
+                                  degree_type_counts=dict(Counter(stats['degree_types']).most_common()),
+                                  **page_links(next_cursor))
+
+@app.route('/admin/stats')
+def admin_stats():
+    """Dashboard counters as JSON, cheap enough to poll"""
+    return jsonify(store.stats())
 
 @app.route('/admin/search')
 def admin_search():
     hall_ticket = request.args.get('hall_ticket', '')
-    apps = load_json(APPLICATIONS_FILE)
-    verified_apps = load_json(VERIFIED_CERTIFICATES_FILE)
-    
-    # Search in both applications and verified certificates
-    search_results = []
-    
-    # Search in pending applications
-    for app in apps:
-        if app.get('roll_number') == hall_ticket:
-            search_results.append(app)
+    # Verified certificates are applications too, so each appears once
+    search_results = store.find_by_roll(hall_ticket)
     
-    # Search in verified certificates
-    for cert in verified_apps:
-        if cert.get('roll_number') == hall_ticket:
-            search_results.append(cert)
-    
-    return render_template_string(BASE.replace('{{content}}', ADMIN_SEARCH_TEMPLATE), 
+    return render_template('admin_search.html', 
                                   hall_ticket=hall_ticket,
                                   search_results=search_results,
                                   get_current_stage=get_current_stage)
 
 @app.route('/admin/details/<app_no>')
 def admin_view_details(app_no):
-    apps = load_json(APPLICATIONS_FILE)
-    verified_apps = load_json(VERIFIED_CERTIFICATES_FILE)
-    
-    # Search in both applications and verified certificates
-    app_data = next((a for a in apps if a.get('app_number') == app_no), None)
-    if not app_data:
-        app_data = next((a for a in verified_apps if a.get('app_number') == app_no), None)
-        
+    app_data = store.get(app_no)
     if not app_data:
         return redirect(url_for('admin_dashboard'))
 
@@ -2864,7 +4053,7 @@ def admin_view_details(app_no):
     timeline = build_timeline(app_data)
     progress_percentage = get_progress_percentage(timeline)
     
-    return render_template_string(BASE.replace('{{content}}', ADMIN_DETAIL_TEMPLATE), 
+    return render_template('admin_detail.html', 
                                   app_data=app_data, 
                                   current_stage=current_stage,
                                   timeline=timeline, 
@@ -2872,66 +4061,157 @@ def admin_view_details(app_no):
 
 @app.route('/admin/download_excel', methods=['POST'])
 def download_excel():
-    from_date = request.form.get('from_date')
-    to_date = request.form.get('to_date')
-    
+    return export_response(request.form.get('from_date'), request.form.get('to_date'), 'xlsx')
+
+@app.route('/admin/export', methods=['GET', 'POST'])
+def admin_export():
+    """Date-range export as xlsx, csv, jsonl or parquet (?format=, default xlsx)"""
+    return export_response(request.values.get('from_date'), request.values.get('to_date'),
+                           request.values.get('format', 'xlsx'))
+
+def export_job_response(job, status=200):
+    return jsonify(dict(
+        job,
+        status_url=url_for('export_job_status', job_id=job['job_id']),
+        download_url=url_for('download_export_job', job_id=job['job_id']) if job['status'] == 'done' else None,
+    )), status
+
+@app.route('/admin/export_jobs', methods=['POST'])
+def create_export_job():
+    """Run a date-range export in the background; poll status_url, then fetch download_url"""
+    return export_response(request.values.get('from_date'), request.values.get('to_date'),
+                           request.values.get('format', 'xlsx'), background=True)
+
+@app.route('/admin/export_jobs/<job_id>')
+def export_job_status(job_id):
+    job = load_export_job(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown export job'}), 404
+    return export_job_response(job)
+
+@app.route('/admin/export_jobs/<job_id>/download')
+def download_export_job(job_id):
+    job = load_export_job(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown export job'}), 404
+    if job['status'] != 'done':
+        return export_job_response(job, 409)
+    return send_file(os.path.abspath(export_job_path(job_id, job['format'])), as_attachment=True,
+                     download_name=f"applications_{job['from_date']}_to_{job['to_date']}.{job['format']}",
+                     mimetype=EXPORT_FORMATS[job['format']])
+
+def export_response(from_date, to_date, export_format, background=False):
     if not from_date or not to_date:
         return "Please select both from and to dates", 400
+    if export_format not in EXPORT_FORMATS:
+        return f"Unsupported export format: {export_format}", 400
+    if export_format == 'parquet' and pq is None:
+        return "Parquet export requires pyarrow to be installed", 400
     
-    apps = load_json(APPLICATIONS_FILE)
-    
-    # Filter applications by date range
-    filtered_apps = []
-    for app in apps:
-        submission_date = app.get('submission_time', '')[:10]  # Get YYYY-MM-DD part
-        if from_date <= submission_date <= to_date:
-            filtered_apps.append(app)
+    if background:
+        job = start_export_job(from_date, to_date, export_format)
+        return export_job_response(job, 200 if job['status'] == 'done' else 202)
     
-    if not filtered_apps:
+    apps = export_applications(from_date, to_date)
+    first = next(apps, None)
+    if first is None:
         return "No data found for the selected date range", 404
+    apps = itertools.chain([first], apps)
     
-    # Create DataFrame
-    data = []
-    for app in filtered_apps:
-        row = {
-            'Application Number': app.get('app_number', ''),
-            'Student Name': app.get('student_name', ''),
-            'Hall Ticket No': app.get('roll_number', ''),
-            'Certificate Type': app.get('certificate_type', ''),
-            'Degree Type': app.get('degree_type', ''),
-            'Program': app.get('sub_category', ''),
-            'Fee Option': app.get('fee_option_label', ''),
-            'Submitted Documents': ', '.join(app.get('certificate_documents', [])),
-            'Submission Time': app.get('submission_time', ''),
-            'Current Stage': get_current_stage(app),
-            'Block Office Status': app.get('verification_status', 'Pending'),
-            'Computer Session Status': app.get('computer_session_status', 'Pending'),
-            'Re-Block Status': app.get('reblock_status', 'Pending'),
-            'AR Session Status': app.get('ar_status', 'Pending'),
-            'VR Session Status': app.get('vr_status', 'Pending'),
-            'Post Session Status': app.get('post_status', 'Pending'),
-            'Verified': 'Yes' if app.get('verified_time') else 'No'
-        }
-        data.append(row)
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Applications', index=False)
+    filename = f"applications_{from_date}_to_{to_date}.{export_format}"
+    mimetype = EXPORT_FORMATS[export_format]
+    if export_format in ('csv', 'jsonl'):
+        lines = csv_lines(apps) if export_format == 'csv' else jsonl_lines(apps)
+        return Response(stream_with_context(lines), mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename="{filename}"'})
     
+    # Binary formats are spooled to a temp file row by row, then sent
+    output = tempfile.TemporaryFile()
+    if export_format == 'xlsx':
+        write_excel(apps, output)
+    else:
+        write_parquet(apps, output)
     output.seek(0)
-    
-    # Send file
-    filename = f"applications_{from_date}_to_{to_date}.xlsx"
-    return send_file(
-        output,
-        as_attachment=True,
-        download_name=filename,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    return send_file(output, as_attachment=True, download_name=filename, mimetype=mimetype)
+
+# JSON API for machine clients (kiosk, scanning station): the same store, duplicate
+# check and cursors as the HTML routes, without rendering pages
+API_REQUIRED_FIELDS = ['student_name', 'roll_number', 'degree_type', 'sub_category', 'certificate_type']
+
+def api_error(message, status):
+    return jsonify({'error': message}), status
+
+def api_body():
+    """The request's JSON object, or {} if the body is not one"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else {}
+
+@app.route('/api/v1/stages/<stage>/applications')
+def api_list_applications(stage):
+    """Applications waiting at a stage (or 'pending' / 'verified'), newest first: ?search=&date=&cursor=&limit="""
+    if stage not in STAGES and stage not in ('pending', 'verified'):
+        return api_error(f"Unknown stage: {stage}", 404)
+    page, next_cursor = paginate(filter_apps(stage, request.args.get('search', ''), request.args.get('date', '')), *page_args())
+    return jsonify({'applications': [a.to_dict() for a in page], 'next_cursor': next_cursor})
+
+@app.route('/api/v1/applications/<app_no>')
+def api_get_application(app_no):
+    a = store.get(app_no)
+    if not a:
+        return api_error(f"Unknown application: {app_no}", 404)
+    return jsonify(dict(a.to_dict(), current_stage=get_current_stage(a)))
+
+@app.route('/api/v1/students/<roll_number>/applications')
+def api_find_applications(roll_number):
+    return jsonify({'applications': [dict(a.to_dict(), current_stage=get_current_stage(a)) for a in store.find_by_roll(roll_number)]})
+
+@app.route('/api/v1/applications', methods=['POST'])
+def api_submit_application():
+    """Submit an application as a JSON object with the application form's fields"""
+    data = api_body()
+    missing = [f for f in API_REQUIRED_FIELDS if not data.get(f)]
+    if missing:
+        return api_error(f"Missing fields: {', '.join(missing)}", 400)
+    # fee_option may be left out, as on the application form
+    not_text = [f for f in API_REQUIRED_FIELDS if not isinstance(data[f], str)]
+    if data.get('fee_option') is not None and not isinstance(data['fee_option'], str):
+        not_text.append('fee_option')
+    if not_text:
+        return api_error(f"Fields must be strings: {', '.join(not_text)}", 400)
+    documents = data.get('certificate_documents') or []
+    if not isinstance(documents, list) or not all(isinstance(d, str) for d in documents):
+        return api_error("certificate_documents must be a list of strings", 400)
+    a = new_application(data, documents)
+    if not store.add(a):
+        return api_error("An application for this hall ticket and certificate type already exists", 409)
+    return jsonify(a), 201, {'Location': url_for('api_get_application', app_no=a['app_number'])}
+
+@app.route('/api/v1/applications/<app_no>/transitions', methods=['POST'])
+def api_transition(app_no):
+    """Approve an application at a stage: {"stage": "<stage key>"}"""
+    stage = api_body().get('stage')
+    if not isinstance(stage, str) or stage not in STAGES:
+        return api_error(f"Unknown stage: {stage}", 400)
+    if not store.get(app_no):
+        return api_error(f"Unknown application: {app_no}", 404)
+    if not store.transition(app_no, stage):
+        return api_error(f"Application {app_no} is not waiting at {stage}", 409)
+    return jsonify(store.get(app_no).to_dict())
+
+@app.route('/api/v1/stages/<stage>/transitions', methods=['POST'])
+def api_bulk_transition(stage):
+    """Approve several applications at a stage in one write: {"app_numbers": [...]}; returns how many moved"""
+    if stage not in STAGES:
+        return api_error(f"Unknown stage: {stage}", 404)
+    app_numbers = api_body().get('app_numbers')
+    if not isinstance(app_numbers, list) or not all(isinstance(n, str) for n in app_numbers):
+        return api_error("app_numbers must be a list of strings", 400)
+    return jsonify({'moved': store.transition_many(app_numbers, stage)})
 
 if __name__=='__main__':
+    # The dev server runs each request in its own thread
+    LIVE_QUEUES = True
     init_json_files()
+    store.collapse_legacy_verified()
+    store.compact()
     app.run(debug=True, host='0.0.0.0', port=5000)
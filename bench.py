@@ -0,0 +1,106 @@
+"""Micro-benchmarks for the certificate system.
+
+    python bench.py templates [--rows N] [--repeat N]
+    python bench.py codecs [--sizes N [N ...]]
+    python bench.py records [--count N]
+"""
+import argparse, gc, json, os, tempfile, time, timeit, tracemalloc
+
+def bench_templates(rows, repeat):
+    """Per-request cost of BASE.replace + render_template_string vs the precompiled DictLoader templates"""
+    os.chdir(tempfile.mkdtemp())
+    import app as m
+    from flask import render_template, render_template_string
+
+    apps = [{
+        'app_number': f'SKD20250101{i:06d}', 'student_name': f'Student {i}', 'roll_number': f'HT{i:06d}',
+        'certificate_type': 'Provisional', 'submission_time': '2025-01-01 10:00:00',
+    } for i in range(rows)]
+    stage = dict(m.STAGES['block'], key='block')
+    with m.app.test_request_context('/block'):
+        def per_request():
+            return render_template_string(m.BASE.replace('{{content}}', m.STAGE_QUEUE), stage=stage, apps=apps, next_url=None, first_url='/block')
+
+        def precompiled():
+            return render_template('stage_queue.html', stage=stage, apps=apps, next_url=None, first_url='/block')
+
+        assert per_request() == precompiled()
+        for name, fn in [('render_template_string', per_request), ('precompiled', precompiled)]:
+            best = min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat
+            print(f"{name:>24}: {best * 1000:8.3f} ms/request ({rows} rows)")
+
+def sample_applications(count, fields):
+    """count verified applications with every field filled in, like a long-running deployment's snapshot"""
+    apps = []
+    for i in range(count):
+        stamp = f'2025-01-{1 + i % 28:02d} 10:{i % 60:02d}:{i // 60 % 60:02d}'
+        a = {f: stamp if f.endswith('_time') else 'approved' for f in fields}
+        a.update({
+            'app_number': f'SKD20250101{i:06X}', 'student_name': f'Student {i}', 'roll_number': f'HT{i:07d}',
+            'degree_type': 'UG', 'sub_category': 'B.Sc', 'certificate_type': 'Provisional',
+            'certificate_documents': ['Marks memo', 'Aadhar'], 'fee_option': 'normal', 'fee_option_label': 'Normal (Rs. 500)',
+            'status': 'Verified', 'verification_status': 'approve',
+        })
+        apps.append(a)
+    return apps
+
+def bench_codecs(sizes):
+    """Save time, load time and file size of the applications snapshot for each codec"""
+    os.chdir(tempfile.mkdtemp())
+    import app as m
+
+    codecs = [('json indent=2', m.save_json, m.load_json), ('json', m.save_snapshot, m.load_snapshot)]
+    if m.msgpack is not None:
+        codecs.append(('msgpack', lambda f, d: m.save_snapshot(f, d, 'msgpack'), m.load_snapshot))
+    codecs.append(('pickle', lambda f, d: m.save_snapshot(f, d, 'pickle'), m.load_snapshot))
+    for size in sizes:
+        apps = sample_applications(size, m.APPLICATION_FIELDS)
+        for name, save, load in codecs:
+            filename = f'applications-{size}.snapshot'
+            start = time.perf_counter()
+            save(filename, apps)
+            saved = time.perf_counter() - start
+            gc.collect()
+            start = time.perf_counter()
+            loaded = load(filename)
+            load_time = time.perf_counter() - start
+            assert len(loaded) == size
+            del loaded
+            print(f"{size:>9} {name:>14}: save {saved * 1000:9.1f} ms  load {load_time * 1000:9.1f} ms  "
+                  f"{os.path.getsize(filename) / 2 ** 20:8.1f} MiB")
+            os.unlink(filename)
+        del apps
+
+def bench_records(count):
+    """Memory held by count applications loaded from a snapshot as dicts vs Application records"""
+    os.chdir(tempfile.mkdtemp())
+    import app as m
+
+    snapshot = json.dumps(sample_applications(count, m.APPLICATION_FIELDS))
+    for name, load in [('dict', json.loads), ('Application', lambda s: [m.Application(a) for a in json.loads(s)])]:
+        gc.collect()
+        tracemalloc.start()
+        records = load(snapshot)
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del records
+        print(f"{name:>12}: {held / 2 ** 20:8.1f} MiB  {held / count:6.0f} bytes/record ({count} records)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    templates = commands.add_parser('templates', help=bench_templates.__doc__)
+    templates.add_argument('--rows', type=int, default=50)
+    templates.add_argument('--repeat', type=int, default=100)
+    codecs = commands.add_parser('codecs', help=bench_codecs.__doc__)
+    codecs.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    records = commands.add_parser('records', help=bench_records.__doc__)
+    records.add_argument('--count', type=int, default=100_000)
+    args = parser.parse_args()
+    if args.command == 'templates':
+        bench_templates(args.rows, args.repeat)
+    elif args.command == 'codecs':
+        bench_codecs(args.sizes)
+    elif args.command == 'records':
+        bench_records(args.count)
@@ -0,0 +1,15 @@
+# gunicorn settings, read from the working directory: gunicorn app:app
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# Each open stage dashboard holds a live queue stream (/<stage>/events). Threaded
+# workers give each stream a thread instead of a whole sync worker, so the rest of
+# the site keeps answering; the worker timeout is a heartbeat, not a request limit.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+timeout = 30
+
+# Turn on the live stream routes and the dashboard client (see LIVE_QUEUES in app.py)
+raw_env = ['LIVE_QUEUES=1']